@@ -0,0 +1,125 @@
+"""Batch solver: shard many maze instances across a process pool.
+
+    python batch.py --levels 1 2 3 4 5 --algorithm bfs astar
+    python batch.py --input mazes.jsonl --workers 8 --output results.jsonl
+
+Each input line is a JSON object: {"level": n} for a built-in level,
+{"file": path} for a level file (see levels.py), {"generate": {"width": w,
+"height": h, "seed": s, ...}} for a generated maze (see generator.py), or
+{"grid": [[...]], "start": [x, y], "goal": [x, y], "key": [x, y]}, each
+with an optional "has_key" and "id". Every (instance, algorithm) pair produces one
+JSON line, written in input order as soon as its shard finishes.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from maze import Maze
+from search import ENGINES
+from solution_cache import SolutionCache
+from solver import solve_maze
+
+_cache = None          # per-process SolutionCache, set by _init_worker
+
+
+def maze_from_spec(spec):
+    if "file" in spec:
+        return Maze.from_file(spec["file"])
+    if "generate" in spec:
+        from generator import generate_maze
+        return generate_maze(**spec["generate"])
+    if "level" in spec and "grid" not in spec:
+        return Maze(int(spec["level"]))
+    return Maze.from_grid(spec["grid"], spec["start"], spec["goal"], spec.get("key"),
+                          spec.get("enemy_spawns", ()))
+
+
+def _init_worker(cache_dir):
+    global _cache
+    _cache = SolutionCache(cache_dir) if cache_dir else None
+
+
+def solve_job(job):
+    """Solve one (instance id, spec, algorithm) job; runs inside a worker."""
+    job_id, spec, algorithm = job
+    maze = maze_from_spec(spec)
+    return {"id": job_id, **solve_maze(maze, algorithm, bool(spec.get("has_key", False)), _cache)}
+
+
+def read_instances(path):
+    """Yield (id, spec) pairs from a JSONL file ('-' for stdin)."""
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if line:
+                spec = json.loads(line)
+                yield spec.get("id", n), spec
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def run_batch(jobs, out, workers=None, chunksize=None, cache_dir=None):
+    """Solve jobs and write one JSON line per result to out; returns the count.
+
+    cache_dir enables a SolutionCache shared by all workers through its disk tier.
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker(cache_dir)
+        results = map(solve_job, jobs)
+        pool = None
+    else:
+        # Large chunks keep pickling/IPC overhead small next to solve time.
+        chunksize = chunksize or max(1, len(jobs) // (workers * 8))
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(cache_dir,))
+        results = pool.map(solve_job, jobs, chunksize=chunksize)
+    count = 0
+    try:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            count += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return count
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Solve many ice mazes in parallel (JSONL out).")
+    parser.add_argument("--input", help="JSONL file of maze instances ('-' for stdin)")
+    parser.add_argument("--levels", type=int, nargs="*", default=[], help="built-in levels to include")
+    parser.add_argument("--algorithm", nargs="+", default=["bfs"], choices=sorted(ENGINES))
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="jobs per worker task")
+    parser.add_argument("--output", default="-", help="output JSONL file ('-' for stdout)")
+    parser.add_argument("--cache-dir", help="solution cache directory shared by the workers")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    instances = [(f"level-{lvl}", {"level": lvl}) for lvl in args.levels]
+    if args.input:
+        instances += list(read_instances(args.input))
+    if not instances:
+        instances = [(f"level-{lvl}", {"level": lvl}) for lvl in range(1, 6)]
+    jobs = [(job_id, spec, algo) for job_id, spec in instances for algo in args.algorithm]
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run_batch(jobs, out, args.workers, args.chunksize, args.cache_dir)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
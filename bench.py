@@ -0,0 +1,152 @@
+"""Benchmark the search engines on the built-in levels and generated mazes.
+
+    python bench.py                                  # print a table
+    python bench.py --sizes 64 128 256 --save bench_baseline.json
+    python bench.py --compare bench_baseline.json    # exit 1 on regressions
+    python bench.py --stop-graph                     # engines on the compressed StopGraph
+
+Each (case, engine) is timed over --repeat runs (best time is kept), then run
+once more under tracemalloc for peak memory. A regression is a time or peak
+memory more than --threshold above the baseline (and by more than a small
+absolute floor, so sub-millisecond noise is ignored), or a change in
+nodes_expanded/slides (both are deterministic).
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from generator import generate_maze
+from maze import Maze
+from search import ENGINES, SearchAlgorithm
+from stop_graph import StopGraph
+
+DEFAULT_SIZES = (32, 64, 128, 256)
+# Engines that revisit states get too slow past this many cells to be useful here
+ENGINE_CELL_LIMITS = {"idastar": 128 * 128, "iddfs": 128 * 128}
+# Differences below these are measurement noise, whatever the relative change
+NOISE_FLOOR = {"time_ms": 1.0, "peak_mem_kb": 16.0}
+
+
+def bench_cases(sizes, seed=1):
+    for level in range(1, 6):
+        yield f"level-{level}", Maze(level)
+    for size in sizes:
+        yield f"gen-{size}x{size}", generate_maze(size, size, seed)
+
+
+def bench_one(maze, algorithm, repeat, graph=None):
+    search = SearchAlgorithm(maze, graph)
+    args = (maze.start_pos, maze.goal_pos, maze.key_pos)
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        found = search.solve(algorithm, *args)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    search.solve(algorithm, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "found": found,
+        "slides": len(search.path) - 1 if found else None,
+        "nodes_expanded": search.nodes_expanded,
+        "time_ms": round(best * 1000, 3),
+        "nodes_per_sec": round(search.nodes_expanded / best) if best > 0 else None,
+        "peak_frontier": search.peak_frontier,
+        "duplicate_hits": search.duplicate_hits,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(algorithms, sizes, repeat, log=None, stop_graph=False):
+    results = []
+    for case, maze in bench_cases(sizes):
+        maze.slides                      # build the table outside the timed region
+        graph = None
+        if stop_graph:
+            graph = StopGraph(maze)
+            graph.reverse_slides()
+            case += "+stops"             # its own baseline rows: bibfs counts differ
+        for algorithm in algorithms:
+            cells = maze.width * maze.height
+            if cells > ENGINE_CELL_LIMITS.get(algorithm, cells):
+                continue
+            row = {"case": case, "algorithm": algorithm, "width": maze.width,
+                   "height": maze.height, **bench_one(maze, algorithm, repeat, graph)}
+            results.append(row)
+            if log:
+                log(row)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return human-readable regression messages against baseline results."""
+    base = {(r["case"], r["algorithm"]): r for r in baseline["results"]}
+    problems = []
+    for r in results:
+        b = base.get((r["case"], r["algorithm"]))
+        if b is None:
+            continue
+        name = f"{r['case']}/{r['algorithm']}"
+        for field in ("nodes_expanded", "slides"):
+            if r[field] != b[field]:
+                problems.append(f"{name}: {field} {b[field]} -> {r[field]}")
+        for field in ("time_ms", "peak_mem_kb"):
+            if b[field] and r[field] > b[field] * (1 + threshold) \
+                    and r[field] - b[field] > NOISE_FLOOR[field]:
+                problems.append(f"{name}: {field} {b[field]} -> {r[field]} "
+                                f"(+{(r[field] / b[field] - 1) * 100:.0f}%)")
+    return problems
+
+
+def _print_row(row):
+    print(f"{row['case']:>14} {row['algorithm']:>8} {row['slides'] if row['found'] else '-':>6} "
+          f"{row['nodes_expanded']:>9} {row['time_ms']:>10.3f} {row['nodes_per_sec'] or 0:>11} "
+          f"{row['peak_frontier']:>8} {row['peak_mem_kb']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ice maze search engines.")
+    parser.add_argument("--algorithm", nargs="+", default=sorted(ENGINES), choices=sorted(ENGINES))
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES),
+                        help="side lengths of generated mazes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown / memory growth (default 0.25)")
+    parser.add_argument("--stop-graph", action="store_true",
+                        help="run the engines on the compressed stop-point graph")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':>14} {'engine':>8} {'slides':>6} {'nodes':>9} {'time_ms':>10} "
+          f"{'nodes/s':>11} {'frontier':>8} {'peak_kb':>10}")
+    results = run_benchmarks(args.algorithm, args.sizes, args.repeat, log=_print_row,
+                             stop_graph=args.stop_graph)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=1)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.threshold)
+        for p in problems:
+            print("REGRESSION " + p)
+        if problems:
+            return 1
+        print("No regressions against " + args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
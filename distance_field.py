@@ -0,0 +1,97 @@
+"""Slides-to-finish for every (position, has_key) state of a maze (no pygame needed).
+
+    field = DistanceField(maze)
+    field.distance(pos, has_key)     # -1 if Echo Base cannot be reached
+    field.next_move(pos, has_key)    # ('left', (3, 4)) or None
+    field.path(pos, has_key)         # optimal slide path, like bfs_with_key
+
+One reverse BFS from (goal, has key), SearchAlgorithm.goal_distances, fills
+the table, after which any replan is a walk down the distances and costs only
+its own length. Build a new field after editing maze.grid.
+"""
+from maze import DIRECTIONS
+from search import SearchAlgorithm
+
+
+class DistanceField:
+    """Reverse BFS distances over packed states, cell*2 + has_key.
+
+    The key flag follows the search engines: it is the flag on arrival, and
+    standing on the key cell counts as holding it. Echo Base is never
+    entered without the key.
+    """
+    def __init__(self, maze, goal=None, key_pos=None):
+        self.maze = maze
+        w = maze.width
+        goal = maze.goal_pos if goal is None else goal
+        key_pos = maze.key_pos if key_pos is None else key_pos
+        self.goal_c = goal[1] * w + goal[0]
+        self.key_c = -1 if key_pos is None else key_pos[1] * w + key_pos[0]
+        # on the raw grid a node is its cell, so the packed states line up
+        self.dist = SearchAlgorithm(maze, trace=False).goal_distances(goal, key_pos)[0]
+
+    def _state(self, pos, has_key):
+        cell = pos[1] * self.maze.width + pos[0]
+        return cell * 2 + (1 if (has_key or cell == self.key_c) else 0)
+
+    def distance(self, pos, has_key=False):
+        """Fewest slides from pos to Echo Base (collecting the key first), or -1."""
+        st = self._state(pos, has_key)
+        if st >> 1 == self.goal_c and st & 1:
+            return 0
+        return self.dist[st]
+
+    def _next_state(self, st):
+        """Successor of st one slide closer to the finish (first in DIRECTIONS order)."""
+        slides = self.maze.slides
+        cur, has_key = st >> 1, st & 1
+        want = self.dist[st] - 1
+        for d in range(4):
+            nb = slides[cur * 4 + d]
+            if nb < 0 or (nb == self.goal_c and not has_key):
+                continue
+            nst = nb * 2 + (1 if (has_key or nb == self.key_c) else 0)
+            if self.dist[nst] == want:
+                return d, nst
+        return None
+
+    def next_move(self, pos, has_key=False):
+        """(direction, stop position) of an optimal slide from pos, or None."""
+        if self.distance(pos, has_key) <= 0:
+            return None
+        d, nst = self._next_state(self._state(pos, has_key))
+        w = self.maze.width
+        return DIRECTIONS[d], ((nst >> 1) % w, (nst >> 1) // w)
+
+    def moves(self, pos, has_key=False):
+        """[(slides left after the move, direction, stop position)] for every legal slide, best first.
+
+        Moves that can no longer finish are left out.
+        """
+        slides = self.maze.slides
+        w = self.maze.width
+        st = self._state(pos, has_key)
+        cur, has_key = st >> 1, st & 1
+        out = []
+        for d in range(4):
+            nb = slides[cur * 4 + d]
+            if nb < 0 or (nb == self.goal_c and not has_key):
+                continue
+            left = self.dist[nb * 2 + (1 if (has_key or nb == self.key_c) else 0)]
+            if left >= 0:
+                out.append((left, DIRECTIONS[d], (nb % w, nb // w)))
+        out.sort(key=lambda m: m[0])
+        return out
+
+    def path(self, pos, has_key=False):
+        """Optimal list of positions from pos to Echo Base, or [] if unreachable."""
+        n = self.distance(pos, has_key)
+        if n < 0:
+            return []
+        w = self.maze.width
+        st = self._state(pos, has_key)
+        path = [tuple(pos)]
+        for _ in range(n):
+            st = self._next_state(st)[1]
+            path.append(((st >> 1) % w, (st >> 1) // w))
+        return path
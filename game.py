@@ -0,0 +1,867 @@
+"""Pygame front end: rendering, input, enemies and autopilot."""
+import pygame
+import sys
+import time
+import os
+import math
+import random
+import tracemalloc
+from functools import partial
+
+from instrument import FrameProfiler, search_stats
+from maze import Maze
+from patrols import PatrolTable
+from render_cache import SurfaceCache
+import replay
+from search import SearchAlgorithm
+from search_worker import SearchWorker
+from simulation import COMPLETE, GAME_OVER, RUNNING, TICK_RATE, Simulation
+from solution_cache import DEFAULT_CACHE_DIR, SolutionCache, capture, restore, solution_key
+
+# ---------------------------
+# Constants / Colors
+# ---------------------------
+# Use larger grid so levels 4-5 fit; earlier levels just draw inside this area.
+GRID_WIDTH = 16
+GRID_HEIGHT = 10
+CELL_SIZE = 60
+WINDOW_WIDTH = GRID_WIDTH * CELL_SIZE + 350
+WINDOW_HEIGHT = GRID_HEIGHT * CELL_SIZE + 100
+FPS = 60
+SPACETIME_LABEL = "PATROL DODGER (SPACE-TIME)"
+MAX_CATCHUP_TICKS = 15                 # ticks run after a stall, at most (0.25 s)
+UI_PANEL_RECT = pygame.Rect(GRID_WIDTH * CELL_SIZE + 10, 10, 320, WINDOW_HEIGHT - 40)
+MUSIC_FILE = "game_theme.mp3"
+
+SPACE_BLACK = (10, 10, 20)
+ICE_BLUE = (173, 216, 255)
+WALL_GRAY = (60, 70, 85)
+DARK_GRAY = (30, 35, 45)
+REBEL_ORANGE = (255, 165, 0)
+EMPIRE_RED = (220, 20, 60)
+JEDI_GREEN = (50, 205, 50)
+SABER_BLUE = (64, 164, 255)
+FORCE_PURPLE = (138, 43, 226)
+HOTH_WHITE = (245, 245, 255)
+CONSOLE_GREEN = (0, 255, 127)
+HOLOGRAM_CYAN = (0, 255, 255)
+KEY_GOLD = (255, 215, 0)
+
+# ---------------------------
+# Game
+# ---------------------------
+class StarWarsIceMazeGame:
+    def __init__(self, profile_path=None, record_dir=None):
+        # Display/audio start here rather than at import so maze.py and
+        # search.py stay usable without a window or sound card.
+        pygame.init()
+        self._start_music()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Star Wars: Hoth Ice Maze - Multi-Level Mission")
+        self.clock = pygame.time.Clock()
+
+        # Fonts and reusable surfaces (see render_cache.py)
+        self.cache = SurfaceCache()
+        self.font = self.cache.font(24)
+        self.title_font = self.cache.font(32)
+        self.console_font = self.cache.font(20)
+
+        # Level state
+        self.current_level = 1
+        self.max_level = 5
+
+        # Images
+        self.images = self.load_images()
+
+        # World + search
+        self.maze = Maze(self.current_level)
+        self.search = SearchAlgorithm(self.maze)
+
+        # Game state
+        self.manual_mode = True
+        self.current_algorithm = None
+        self.visualization_step = 0
+        self.animating = False
+        self.animation_speed = 8          # scan cells revealed per second
+        self._scan_ticks = 0
+        self.solution_found = False
+        self.worker = SearchWorker()
+        self.search_job = None            # SearchJob running on the worker
+        self._search_cache_key = None     # where to store the running job's result
+        self._on_search_done = None       # called with found when the running job finishes
+        self.notice = None                # one-line message for the panel, e.g. a planning fallback
+        try:
+            self.solutions = SolutionCache(DEFAULT_CACHE_DIR)
+        except OSError as e:
+            print(f"Solution cache kept in memory only: {e}")
+            self.solutions = SolutionCache()
+        self._search_serial = 0           # bumped per scan, keys the board cache
+        self.drawn_path = False
+        self.game_completed = False
+        self.show_start_screen = True
+
+        # Pilot, patrols, autopilot and key/exit rules advance in fixed ticks
+        # (simulation.py); update() feeds them from the wall clock. With a
+        # record_dir each level played is saved there as a replay (replay.py)
+        self.record_dir = record_dir
+        self._replays_saved = 0
+        self.sim = Simulation(self.maze, manual=self.manual_mode, record=record_dir is not None)
+        self.game_over = False
+        self._tick_budget = 0.0
+        self._last_update = time.perf_counter()
+        self.show_hint = False
+
+        # Visual effects
+        self.glow_effect = 0
+        self.scan_lines = 0
+        self.key_glow = 0
+
+        # Render caches: static background per level, board = background plus
+        # search overlays, and rects drawn last frame for dirty-rect updates
+        self._background = None
+        self._background_level = None
+        self._board = None
+        self._board_key = None
+        self._board_viz_step = 0
+        self._board_path_drawn = False
+        self._last_entity_rects = []
+        self._full_redraw = True
+
+        # Instrumentation (F3 overlay); with a profile_path it records from
+        # the start and is exported when the game exits
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(enabled=profile_path is not None)
+        self.show_perf = False
+
+    # ---------- assets ----------
+    def _start_music(self):
+        try:
+            pygame.mixer.init()
+            pygame.mixer.music.load(MUSIC_FILE)
+            pygame.mixer.music.play(-1)  # -1 makes it loop indefinitely
+        except pygame.error as e:
+            print(f"Music disabled: {e}")
+
+    def load_images(self):
+        images = {}
+        for name, filename in {'player':'pic1.png','base':'pic2.png','key':'key.png'}.items():
+            try:
+                if os.path.exists(filename):
+                    img = pygame.image.load(filename).convert_alpha()
+                    images[name] = pygame.transform.scale(img, (CELL_SIZE-10, CELL_SIZE-10))
+                else:
+                    images[name] = None
+            except Exception:
+                images[name] = None
+        return images
+
+    def _hint(self):
+        """(direction, stop position) of an optimal slide for the pilot, or None."""
+        if not (self.show_hint and self.manual_mode):
+            return None
+        return self.sim.distance_field().next_move(self.sim.player_pos, self.maze.key_collected)
+
+    def _sync_sim(self):
+        """Print the simulation's messages and react to the level ending."""
+        for _, text in self.sim.events:
+            print(text)
+        self.sim.events.clear()
+        if self.sim.status == COMPLETE and not self.game_completed:
+            self.complete_level()
+        elif self.sim.status == GAME_OVER and not self.game_over:
+            self._trigger_game_over()
+
+    def _trigger_game_over(self):
+        self.game_over = True
+        self.animating = False
+        self._cancel_search()
+
+    # ---------- Level helpers ----------
+    def load_new_level(self):
+        self._save_replay()
+        self.maze = Maze(self.current_level)
+        self.search = SearchAlgorithm(self.maze)
+        self.reset_search_ui_flags()
+        self.sim = Simulation(self.maze, manual=self.manual_mode, record=self.record_dir is not None)
+
+    def _save_replay(self):
+        """Write the level just played (inputs and outcome) to record_dir."""
+        if self.record_dir is None or not self.sim.tick_count:
+            return
+        os.makedirs(self.record_dir, exist_ok=True)
+        self._replays_saved += 1
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self._replays_saved:03d}-level{self.sim.maze.level}.imr"
+        replay.save(os.path.join(self.record_dir, name), replay.capture(self.sim))
+
+    def complete_level(self):
+        if self.current_level < self.max_level:
+            print(f"Level {self.current_level} complete! Moving to {self.current_level+1}.")
+            self.current_level += 1
+            self.load_new_level()
+        else:
+            self.game_completed = True
+            print("All levels completed! You've reached Echo Base!")
+
+    def start_new_game(self):
+        self.current_level = 1
+        self.load_new_level()
+        self.show_start_screen = True
+        self.game_completed = False
+        print("Starting new game at Level 1...")
+
+    def reset_search_ui_flags(self):
+        self._cancel_search()
+        self.search.reset()
+        self.current_algorithm = None
+        self.visualization_step = 0
+        self.animating = False
+        self.solution_found = False
+        self.drawn_path = False
+        self.game_over = False
+        self.notice = None
+
+    # ---------- Input ----------
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+
+            if event.type == pygame.KEYDOWN:
+
+                if event.key == pygame.K_F3:
+                    self.show_perf = not self.show_perf
+                    self.profiler.enabled = self.show_perf or self.profile_path is not None
+                    continue
+
+                # --- Start screen ---
+                if self.show_start_screen:
+                    if event.key == pygame.K_1:
+                        self.manual_mode = True
+                        self.show_start_screen = False
+                    elif event.key == pygame.K_2:
+                        self.manual_mode = False
+                        self.show_start_screen = False
+                    elif event.key == pygame.K_ESCAPE:
+                        return False
+                    return True
+
+                # --- Game over screen ---
+                if self.game_over:
+                    if event.key in (pygame.K_r, pygame.K_SPACE):
+                        self.load_new_level()  # restart same level (mode preserved)
+                    elif event.key == pygame.K_ESCAPE:
+                        self.start_new_game()
+                    return True
+
+                # --- End screen ---
+                if self.game_completed:
+                    if event.key in (pygame.K_r, pygame.K_SPACE):
+                        self.start_new_game()
+                    elif event.key == pygame.K_ESCAPE:
+                        self.start_new_game()
+                    return True
+
+                # --- In-game controls (Human) ---
+                if self.manual_mode and not self.animating and not self.sim.autopilot:
+                    direction = None
+                    if event.key in (pygame.K_UP, pygame.K_w):
+                        direction = 'up'
+                    elif event.key in (pygame.K_DOWN, pygame.K_s):
+                        direction = 'down'
+                    elif event.key in (pygame.K_LEFT, pygame.K_a):
+                        direction = 'left'
+                    elif event.key in (pygame.K_RIGHT, pygame.K_d):
+                        direction = 'right'
+                    elif event.key == pygame.K_h:
+                        self.show_hint = not self.show_hint
+
+                    # slides, patrol collision, key and exit are the simulation's rules
+                    if direction and self.sim.move(direction):
+                        self._sync_sim()
+                        if self.game_over:
+                            return True
+
+                # --- Algorithm controls (AI mode only) ---
+                if not self.manual_mode:
+                    if event.key == pygame.K_b and not self.animating:
+                        self.start_bfs()
+                    elif event.key == pygame.K_d and not self.animating:
+                        self.start_dfs()
+                    elif event.key == pygame.K_s and not self.animating:
+                        self.start_astar()
+                    elif event.key == pygame.K_i and not self.animating:
+                        self.start_idastar()
+                    elif event.key == pygame.K_t and not self.animating:
+                        self.start_spacetime()
+                    elif event.key == pygame.K_a and self.solution_found and not self.sim.autopilot \
+                            and self.drawn_path and self.search_job is None:
+                        if self.current_algorithm == SPACETIME_LABEL:
+                            self._replan_autopilot()      # patrols kept moving since the scan
+                        else:
+                            self._engage_autopilot(False, True)
+
+                # Works in both modes
+                if event.key == pygame.K_r:
+                    self.load_new_level()  # mode preserved; search state reset
+                elif event.key == pygame.K_m:
+                    # toggle Human/AI (cancels autopilot/scan animation)
+                    self.manual_mode = not self.manual_mode
+                    self.animating = False
+                    self._cancel_search()
+                    self.sim.stop_autopilot()
+                    if self.manual_mode:
+                        # clear search viz if returning to Human
+                        self.search.reset()
+                        self.solution_found = False
+                elif event.key == pygame.K_ESCAPE:
+                    self.start_new_game()
+
+        return True
+
+    # ---------- Search triggers ----------
+    def _start_search(self, label, steps, algorithm=None):
+        """Begin a scan on the worker thread; update() collects the result.
+
+        Scans of an ENGINES algorithm are looked up in the solution cache
+        first; a hit replays the stored expansion order without searching.
+        """
+        self._cancel_search()
+        self.current_algorithm = label
+        query = dict(
+            start=self.sim.player_pos,
+            goal=self.maze.goal_pos,
+            key_pos=self.maze.key_pos,
+            has_key_start=self.maze.key_collected
+        )
+        cached = None
+        if algorithm is not None:
+            self._search_cache_key = solution_key(self.maze, algorithm, **query)
+            cached = self.solutions.get(self._search_cache_key)
+        if cached is not None:
+            try:
+                restore(self.search, cached)
+            except ValueError:
+                cached = None                # corrupt entry: search, and overwrite it when done
+        if cached is not None:
+            self.search_job = None
+        else:
+            self.search_job = self.worker.submit(self.search, steps(**query))
+        self._search_serial += 1
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self.solution_found = cached.found if cached is not None else False
+        self.visualization_step = 0
+        self._scan_ticks = 0
+        self.animating = True
+        self.manual_mode = False
+
+    def _cancel_search(self):
+        # Callers go on to reset or restore into self.search, which the
+        # cancelled job may still be writing to until its slice ends.
+        self._search_cache_key = None
+        self._on_search_done = None
+        if self.search_job is not None:
+            self.search_job.cancel(wait_stopped=True)
+            self.search_job = None
+
+    def start_bfs(self):
+        self._start_search("REBEL SCANNER (BFS)", self.search.iter_bfs_with_key, "bfs")
+
+    def start_dfs(self):
+        self._start_search("EMPIRE PROBE (DFS)", self.search.iter_dfs_with_key, "dfs")
+
+    def start_astar(self):
+        self._start_search("JEDI NAVIGATOR (A*)", self.search.iter_astar_with_key, "astar")
+
+    def start_idastar(self):
+        self._start_search("FORCE MEDITATION (IDA*)", self.search.iter_idastar_with_key, "idastar")
+
+    def start_spacetime(self):
+        patrols = self._patrol_table()
+        if patrols is None:
+            self.start_bfs()
+            return
+        self._start_search(SPACETIME_LABEL, partial(self.search.iter_spacetime_with_key, patrols=patrols))
+
+    def _replan_autopilot(self):
+        """Replan around the patrols as they are now on the worker; the autopilot engages when it is done."""
+        start, goal, key_pos = self.sim.player_pos, self.maze.goal_pos, self.maze.key_pos
+        has_key = self.maze.key_collected
+        patrols = self._patrol_table()
+        if patrols is not None:
+            steps = self.search.iter_spacetime_with_key(start, goal, key_pos, patrols, has_key)
+        else:
+            steps = self.search.iter_bfs_with_key(start, goal, key_pos, has_key)
+        self._cancel_search()
+        self.search_job = self.worker.submit(self.search, steps)
+        self._on_search_done = partial(self._engage_autopilot, patrols is not None)
+        self._search_serial += 1
+
+    def _engage_autopilot(self, timed, found):
+        if found and self.search.path:
+            self.sim.engage_autopilot(self.search.path, timed)
+            self._sync_sim()
+
+    def _patrol_table(self):
+        """PatrolTable of the patrols as they are right now (tick 0), or None.
+
+        None means their combined cycle is too long to tabulate; the caller
+        falls back to an untimed route and the autopilot dodges patrols live.
+        """
+        try:
+            table = PatrolTable(self.maze, self.sim.patrols.states())
+        except (ValueError, MemoryError):
+            self.notice = "PATROL CYCLE TOO LONG TO TIME - UNTIMED ROUTE"
+            return None
+        self.notice = None
+        return table
+
+    # ---------- Update / Draw ----------
+    def update(self):
+        self.glow_effect = (self.glow_effect + 3) % 360
+        self.scan_lines = (self.scan_lines + 2) % WINDOW_HEIGHT
+        self.key_glow = (self.key_glow + 5) % 360
+
+        # collect a finished background search
+        if self.search_job is not None and self.search_job.done():
+            job, self.search_job = self.search_job, None
+            self.solution_found = bool(job.result())
+            if self.profiler.enabled and job.elapsed is not None:
+                peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+                self.profiler.add_search(search_stats(self.search, self.solution_found, job.elapsed, peak))
+            if self._search_cache_key is not None:
+                self.solutions.put(self._search_cache_key, capture(self.search, self.solution_found))
+                self._search_cache_key = None
+            done, self._on_search_done = self._on_search_done, None
+            if done is not None:
+                done(self.solution_found)
+
+        # Advance game time in fixed ticks; after a stall at most MAX_CATCHUP_TICKS run
+        now = time.perf_counter()
+        self._tick_budget = min(self._tick_budget + (now - self._last_update) * TICK_RATE,
+                                MAX_CATCHUP_TICKS)
+        self._last_update = now
+        sim = self.sim
+        sim.set_manual(self.manual_mode)
+        while self._tick_budget >= 1 and sim.status == RUNNING:
+            self._tick_budget -= 1
+            if self.animating:
+                self._step_scan_animation()
+            sim.set_frozen(self.animating)   # patrols hold still while a scan plays
+            sim.tick()
+        self._sync_sim()
+
+    def _step_scan_animation(self):
+        """Reveal the next expanded cell every TICK_RATE / animation_speed ticks."""
+        self._scan_ticks += 1
+        if self._scan_ticks < max(1, round(TICK_RATE / self.animation_speed)):
+            return
+        self._scan_ticks = 0
+        if self.visualization_step < len(self.search.search_order):
+            self.visualization_step += 1
+        elif self.search_job is None:
+            self.animating = False  # finished scanning (the search may still have been running)
+
+    def draw_key(self, pos):
+        if self.maze.key_collected:
+            return
+        x, y = pos[0] * CELL_SIZE, pos[1] * CELL_SIZE
+        cx, cy = x + CELL_SIZE // 2, y + CELL_SIZE // 2
+        if self.images.get('key') is not None:
+            key_rect = self.images['key'].get_rect(center=(cx, cy))
+            self.screen.blit(self.images['key'], key_rect)
+        else:
+            glow = int(128 + 64 * math.sin(math.radians(self.key_glow)))
+            for r in range(25, 15, -2):
+                alpha = max(0, glow - (25 - r) * 10)
+                s = self.cache.filled((r * 2, r * 2), KEY_GOLD, alpha)
+                self.screen.blit(s, s.get_rect(center=(cx, cy)))
+            pygame.draw.circle(self.screen, KEY_GOLD, (cx, cy), 12)
+            pygame.draw.circle(self.screen, (200, 180, 0), (cx, cy), 12, 2)
+            pygame.draw.circle(self.screen, SPACE_BLACK, (cx, cy), 4)
+            pygame.draw.rect(self.screen, KEY_GOLD, (cx + 8, cy - 2, 8, 4))
+
+    def draw_character(self, pos, char_type="rebel"):
+        x, y = pos[0] * CELL_SIZE, pos[1] * CELL_SIZE
+        cx, cy = x + CELL_SIZE // 2, y + CELL_SIZE // 2
+        if char_type == "rebel":
+            if self.images.get('player'):
+                rect = self.images['player'].get_rect(center=(cx, cy))
+                self.screen.blit(self.images['player'], rect)
+                if self.maze.key_collected:
+                    kp = (cx + 20, cy - 20)
+                    pygame.draw.circle(self.screen, KEY_GOLD, kp, 8)
+                    pygame.draw.circle(self.screen, (200, 180, 0), kp, 8, 2)
+                    pygame.draw.circle(self.screen, SPACE_BLACK, kp, 3)
+            else:
+                pygame.draw.circle(self.screen, REBEL_ORANGE, (cx, cy - 5), 18)
+                pygame.draw.circle(self.screen, DARK_GRAY, (cx, cy - 5), 18, 3)
+                pygame.draw.ellipse(self.screen, SABER_BLUE, (cx - 12, cy - 12, 24, 10))
+                pygame.draw.ellipse(self.screen, REBEL_ORANGE, (cx - 10, cy + 5, 20, 15))
+                if self.maze.key_collected:
+                    pygame.draw.circle(self.screen, KEY_GOLD, (cx + 15, cy - 15), 6)
+        else:  # base
+            if self.images.get('base'):
+                rect = self.images['base'].get_rect(center=(cx, cy))
+                self.screen.blit(self.images['base'], rect)
+            else:
+                pygame.draw.polygon(self.screen, ICE_BLUE, [(cx, cy-15),(cx-15, cy+10),(cx+15, cy+10)])
+                lvl = self.cache.text(self.console_font, "BASE", HOTH_WHITE)
+                self.screen.blit(lvl, lvl.get_rect(center=(cx, cy)))
+
+    def draw_enemy(self, x, y):
+        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        cx, cy = rect.center
+        pygame.draw.circle(self.screen, (180, 30, 30), (cx, cy), CELL_SIZE // 3)
+        pygame.draw.circle(self.screen, (255, 80, 80), (cx, cy), CELL_SIZE // 3, 2)
+
+    # ---------- Cached layers ----------
+    def _build_background(self):
+        """Stars and tiles for the current level; walls never change within a level."""
+        bg = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        bg.fill(SPACE_BLACK)
+        rng = random.Random(42 + self.current_level)
+        for _ in range(50 + self.current_level * 8):
+            x = rng.randint(0, GRID_WIDTH * CELL_SIZE)
+            y = rng.randint(0, GRID_HEIGHT * CELL_SIZE)
+            pygame.draw.circle(bg, HOTH_WHITE, (x, y), 1)
+
+        # draw maze area only (actual size is len(grid))
+        rows = len(self.maze.grid)
+        cols = len(self.maze.grid[0])
+        for y in range(rows):
+            for x in range(cols):
+                r = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                if self.maze.is_wall(x, y):
+                    pygame.draw.rect(bg, WALL_GRAY, r)
+                    pygame.draw.rect(bg, ICE_BLUE, r, 2)
+                else:
+                    pygame.draw.rect(bg, HOTH_WHITE, r)
+                    pygame.draw.rect(bg, ICE_BLUE, r, 1)
+        return bg
+
+    def invalidate_background(self):
+        """Force the static layer to be rebuilt, e.g. after editing maze.grid."""
+        self._background = None
+        self._board_key = None
+
+    def _board_signature(self):
+        # Anything that would make the search/path overlay differ from an
+        # incremental extension of what is already on the board.
+        path = self.search.path
+        return (id(self.maze), self.manual_mode, self.current_algorithm,
+                self._search_serial, len(path), path[0] if path else None)
+
+    def draw_grid(self):
+        """Bring the board layer (background + search overlays) up to date.
+
+        Returns the rects of board cells that changed since the last frame.
+        """
+        if self._background is None or self._background_level != self.current_level:
+            self._background = self._build_background()
+            self._background_level = self.current_level
+            self._board_key = None
+
+        dirty = []
+        sig = self._board_signature()
+        if sig != self._board_key:
+            self._board = self._background.copy()
+            self._board_key = sig
+            self._board_viz_step = 0
+            self._board_path_drawn = False
+            self._full_redraw = True
+        board = self._board
+
+        # Search viz (expansion order), only the cells revealed since last frame
+        order = self.search.search_order
+        if not self.manual_mode and order:
+            color = self._scan_color()
+            upto = min(self.visualization_step, len(order))
+            for i in range(self._board_viz_step, upto):
+                pos = order[i]
+                s = self.cache.filled((CELL_SIZE - 10, CELL_SIZE - 10), color, 80)
+                dirty.append(board.blit(s, (pos[0]*CELL_SIZE + 5, pos[1]*CELL_SIZE + 5)))
+            self._board_viz_step = max(self._board_viz_step, upto)
+
+        # Solution path (only in AI mode)
+        if not self.manual_mode and not self.animating and self.solution_found and self.search.path:
+            if not self._board_path_drawn:
+                for pos in self.search.path:
+                    if pos in (self.maze.start_pos, self.maze.goal_pos): continue
+                    s = self.cache.filled((CELL_SIZE - 30, CELL_SIZE - 30), JEDI_GREEN, 128)
+                    dirty.append(board.blit(s, (pos[0]*CELL_SIZE + 15, pos[1]*CELL_SIZE + 15)))
+                self._board_path_drawn = True
+            self.drawn_path = True
+        return dirty
+
+    def _scan_color(self):
+        algo = str(self.current_algorithm)
+        if "BFS" in algo:
+            return SABER_BLUE
+        if "SPACE-TIME" in algo:
+            return KEY_GOLD
+        if "IDA*" in algo:
+            return HOLOGRAM_CYAN
+        if "A*" in algo:
+            return FORCE_PURPLE
+        return EMPIRE_RED
+
+    def _player_draw_pos(self):
+        if self.manual_mode or self.sim.autopilot:
+            return self.sim.player_pos
+        # AI scan mode: show the rebel where you LAST were in human mode
+        return self.search.path[0] if self.search.path else self.sim.player_pos
+
+    def _entity_rects(self):
+        """Cell rects of everything drawn by draw_entities (each stays inside its cell)."""
+        cells = [self.maze.goal_pos, self._player_draw_pos()] + self.sim.patrols.positions()
+        if not self.maze.key_collected:
+            cells.append(self.maze.key_pos)
+        hint = self._hint()
+        if hint:
+            cells.append(hint[1])
+        return [pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE) for x, y in cells]
+
+    def draw_entities(self):
+        self.draw_key(self.maze.key_pos)
+        self.draw_character(self.maze.goal_pos, "base")
+        for x, y in self.sim.patrols.positions():
+            self.draw_enemy(x, y)
+        hint = self._hint()
+        if hint:
+            x, y = hint[1]
+            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            pygame.draw.rect(self.screen, CONSOLE_GREEN, rect.inflate(-8, -8), 2)
+        self.draw_character(self._player_draw_pos(), "rebel")
+
+    # ---------- UI helpers (wrap & fit) ----------
+    def _blit_wrapped(self, text, font, color, x, y, max_width, line_gap=2):
+        """Render text with soft-wrapping inside max_width. Returns new y after drawing."""
+        for surf in self.cache.wrapped(font, text, color, max_width):
+            self.screen.blit(surf, (x, y))
+            y += surf.get_height() + line_gap
+        return y
+
+    def _render_title_fit(self, text, base_size, color, max_width):
+        """Return a surface for title text that is scaled down to fit max_width."""
+        return self.cache.title_fit(text, base_size, color, max_width)
+
+    def draw_start_screen(self):
+        self.screen.fill(SPACE_BLACK)
+        rng = random.Random(42)
+        for _ in range(100):
+            x = rng.randint(0, WINDOW_WIDTH); y = rng.randint(0, WINDOW_HEIGHT)
+            pygame.draw.circle(self.screen, HOTH_WHITE, (x, y), 1)
+        title = self.cache.text(self.cache.font(48), "STAR WARS: HOTH ICE MAZE", HOLOGRAM_CYAN)
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH//2, 100)))
+        subtitle = self.cache.text(self.title_font, "Escape to Echo Base", CONSOLE_GREEN)
+        self.screen.blit(subtitle, subtitle.get_rect(center=(WINDOW_WIDTH//2, 140)))
+        mode = self.cache.text(self.title_font, "SELECT GAME MODE:", REBEL_ORANGE)
+        self.screen.blit(mode, mode.get_rect(center=(WINDOW_WIDTH//2, 200)))
+        for txt, xoff, col1, col2 in (("1 - HUMAN", -200, JEDI_GREEN, CONSOLE_GREEN),
+                                      ("2 - AI", 20, EMPIRE_RED, (150,0,0))):
+            bg = pygame.Rect(WINDOW_WIDTH//2 + xoff, 250, 180, 80)
+            pygame.draw.rect(self.screen, col1, bg); pygame.draw.rect(self.screen, col2, bg, 3)
+            t = self.cache.text(self.title_font, txt, HOTH_WHITE if "AI" in txt else SPACE_BLACK)
+            self.screen.blit(t, t.get_rect(center=(bg.centerx, bg.centery)))
+        lines = [
+            "MISSION: Collect the golden key, then reach Echo Base",
+            "Use WASD or Arrow keys to move (you slide on ice!)",
+            "Press 1 for Human Mode  |  Press 2 for AI Mode",
+            "Press ESC to quit"
+        ]
+        for i, L in enumerate(lines):
+            color = KEY_GOLD if L.startswith("MISSION") else (HOLOGRAM_CYAN if "Press" in L else HOTH_WHITE)
+            t = self.cache.text(self.console_font, L, color)
+            self.screen.blit(t, t.get_rect(center=(WINDOW_WIDTH//2, 380 + i*25)))
+
+    def draw_completion_screen(self):
+        overlay = self.cache.filled((WINDOW_WIDTH, WINDOW_HEIGHT), SPACE_BLACK, 180)
+        self.screen.blit(overlay, (0,0))
+        victory = self.cache.text(self.cache.font(64), "MISSION COMPLETE!", JEDI_GREEN)
+        self.screen.blit(victory, victory.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 100)))
+        success = self.cache.text(self.title_font, "Welcome to Echo Base, Rebel!", CONSOLE_GREEN)
+        self.screen.blit(success, success.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 50)))
+        for i, opt in enumerate(("R or SPACE - Start New Game", "ESC - Main Menu")):
+            t = self.cache.text(self.console_font, opt, HOLOGRAM_CYAN)
+            self.screen.blit(t, t.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + i*30)))
+
+    def draw_game_over(self):
+        overlay = self.cache.filled((WINDOW_WIDTH, WINDOW_HEIGHT), (0,0,0), 200)
+        self.screen.blit(overlay, (0,0))
+        title = self.cache.text(self.cache.font(64), "GAME OVER", (255,80,80))
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 80)))
+        msg = self.cache.text(self.title_font, "A patrol found you!", HOTH_WHITE)
+        self.screen.blit(msg, msg.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 40)))
+        for i, opt in enumerate(("R - Restart level", "ESC - Main menu")):
+            t = self.cache.text(self.console_font, opt, HOLOGRAM_CYAN)
+            self.screen.blit(t, t.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 20 + 28*i)))
+
+    def draw_ui(self):
+        bg = UI_PANEL_RECT
+        ui_x, ui_y = bg.left + 10, bg.top + 10
+        panel_w = bg.width
+        pygame.draw.rect(self.screen, DARK_GRAY, bg); pygame.draw.rect(self.screen, HOLOGRAM_CYAN, bg, 2)
+
+        # Title that always fits the panel
+        title_text = f"LEVEL {self.current_level}: {self.maze.get_level_name().upper()}"
+        title_surf = self._render_title_fit(title_text, 32, HOLOGRAM_CYAN, max_width=panel_w - 40)
+        self.screen.blit(title_surf, (ui_x, ui_y))
+        ui_y += title_surf.get_height() + 6
+
+        # Progress
+        progress = self.cache.text(self.console_font, f"PROGRESS: {self.current_level}/{self.max_level}", CONSOLE_GREEN)
+        self.screen.blit(progress, (ui_x, ui_y))
+        ui_y += 35
+
+        # Mode-specific control list
+        lines = [
+            "MISSION: Collect key, reach base",
+            f"KEY: {'COLLECTED' if self.maze.key_collected else 'FIND THE GOLDEN KEY'}",
+        ]
+        hint = self._hint()
+        if hint:
+            left = self.sim.distance_field().distance(self.sim.player_pos, self.maze.key_collected)
+            lines.append(f"HINT: SLIDE {hint[0].upper()} ({left} TO BASE)")
+        elif self.show_hint and self.manual_mode:
+            lines.append("HINT: NO ROUTE FROM HERE")
+        lines += [
+            "",
+            "CONTROLS:",
+        ]
+        if self.manual_mode:
+            lines += [
+                "WASD/Arrows - Move pilot",
+                "H - Toggle route hint",
+                "R - Reset current level",
+                "M - Toggle Human/AI",
+                "ESC - Main menu",
+            ]
+        else:
+            lines += [
+                "B - BFS (AI mode)   D - DFS (AI mode)",
+                "S - A* (AI mode)    I - IDA* (AI mode)",
+                "T - Dodge patrols (space-time)",
+                "A - Autopilot (after scan)",
+                "R - Reset current level",
+                "M - Toggle Human/AI",
+                "ESC - Main menu",
+            ]
+
+        if self.current_algorithm and not self.manual_mode:
+            job = self.search_job
+            nodes, frontier = job.progress() if job else (self.search.nodes_expanded, self.search.peak_frontier)
+            lines += [
+                "",
+                f"SCANNER: {self.current_algorithm}",
+                f"SECTORS: {len(self.search.explored)}",
+                f"NODES: {nodes}  FRONTIER: {frontier}",
+                f"STATUS: {'ROUTE FOUND' if self.solution_found else 'SEARCHING...'}",
+            ]
+            if self.notice:
+                lines.append(f"NOTICE: {self.notice}")
+
+        # Wrap lines to avoid overflow
+        max_text_w = panel_w - 40
+        for line in lines:
+            if line == "":
+                ui_y += 8
+                continue
+            if "MISSION" in line or "LEVEL" in line:
+                col = HOLOGRAM_CYAN
+            elif "KEY:" in line:
+                col = KEY_GOLD if not self.maze.key_collected else JEDI_GREEN
+            elif "CONTROLS" in line or "SCANNER" in line or line.startswith("NOTICE:"):
+                col = REBEL_ORANGE
+            elif line.startswith("STATUS:"):
+                col = CONSOLE_GREEN
+            else:
+                col = HOTH_WHITE
+            ui_y = self._blit_wrapped(line, self.console_font, col, ui_x, ui_y, max_text_w, line_gap=2)
+
+        # scanlines effect (panel only, so the board can be updated in parts)
+        for i in range(bg.top, bg.bottom, 4):
+            alpha = 20 if (i + self.scan_lines) % 8 < 4 else 10
+            s = self.cache.filled((bg.width, 1), HOLOGRAM_CYAN, alpha)
+            self.screen.blit(s, (bg.left, i))
+
+        if self.show_perf:
+            self.draw_perf_overlay()
+
+        if self.game_over:
+            self.draw_game_over()
+        elif self.game_completed:
+            self.draw_completion_screen()
+
+    def draw_perf_overlay(self):
+        """Stage timings (last/mean/max ms) and the last search, at the foot of the panel."""
+        font = self.cache.font(18)
+        rows = [("PERF ms", "last", "mean", "max"), (f"FPS {self.clock.get_fps():.0f}",)]
+        for stage, (last, mean, peak) in self.profiler.summary().items():
+            rows.append((stage, f"{last:.2f}", f"{mean:.2f}", f"{peak:.2f}"))
+        if self.profiler.searches:
+            st = self.profiler.searches[-1]
+            rows.append((f"SEARCH {st['wall_ms']:.1f} ms, {st['nodes_per_sec'] or 0} nodes/s",))
+            rows.append((f"frontier {st['peak_frontier']}, dups {st['duplicate_hits']}"
+                         + (f", {st['peak_mem_kb']} kB" if st['peak_mem_kb'] is not None else ""),))
+        line_h = font.get_linesize()
+        box = pygame.Rect(UI_PANEL_RECT.left + 4, 0, UI_PANEL_RECT.width - 8, line_h * len(rows) + 8)
+        box.bottom = UI_PANEL_RECT.bottom - 4
+        self.screen.blit(self.cache.filled(box.size, SPACE_BLACK, 220), box.topleft)
+        y = box.top + 4
+        for row in rows:
+            self.screen.blit(self.cache.text(font, row[0], CONSOLE_GREEN), (box.left + 6, y))
+            for i, cell in enumerate(row[1:]):          # right-aligned number columns
+                surf = self.cache.text(font, cell, CONSOLE_GREEN)
+                self.screen.blit(surf, (box.right - 6 - (2 - i) * 56 - surf.get_width(), y))
+            y += line_h
+
+    def _restore_board(self, full, dirty):
+        if full:
+            self.screen.blit(self._board, (0, 0))
+        else:
+            for r in dirty:
+                self.screen.blit(self._board, r, r)
+
+    def draw(self):
+        timed = self.profiler.time
+        if self.show_start_screen:
+            timed("draw_start_screen", self.draw_start_screen)
+            timed("present", pygame.display.flip)
+            self._full_redraw = True
+            return
+
+        board_dirty = timed("draw_grid", self.draw_grid)
+        entity_rects = self._entity_rects()
+        # overlays are translucent over the whole window: redraw it all
+        full = self._full_redraw or self.game_over or self.game_completed
+        dirty = None if full else board_dirty + self._last_entity_rects + entity_rects
+        timed("blit_board", self._restore_board, full, dirty)
+        timed("draw_entities", self.draw_entities)
+        timed("draw_ui", self.draw_ui)
+
+        if full:
+            timed("present", pygame.display.flip)
+        else:
+            timed("present", pygame.display.update, dirty + [UI_PANEL_RECT])
+        self._full_redraw = False
+        self._last_entity_rects = entity_rects
+
+    # ---------- Loop ----------
+    def run(self):
+        running = True
+        prof = self.profiler
+        while running:
+            prof.begin_frame()
+            running = prof.time("handle_events", self.handle_events)
+            prof.time("update", self.update)
+            self.draw()
+            prof.end_frame()
+            self.clock.tick(FPS)
+        self._cancel_search()
+        self.worker.shutdown()
+        self._save_replay()
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
+            print(f"Profile written to {self.profile_path}")
+        pygame.quit(); sys.exit()
@@ -0,0 +1,136 @@
+"""Seeded procedural ice mazes that are always solvable.
+
+The generator first scatters random walls, then lays down a solution as a
+chain of slides from the start: each slide carves its cells open and puts a
+wall right after its last cell, so a player sliding that way stops exactly
+there. Carved cells and stopper walls are pinned, and later slides may not
+undo them, which keeps every earlier slide valid. The key sits at a stop
+about halfway along the chain and the goal at its last stop, so the level is
+solvable under slide rules with key-before-goal without running a search.
+
+    python generator.py 1000 1000 --seed 7 --enemies 50 -o big.mazeb
+"""
+import argparse
+import random
+import sys
+
+from levels import LevelData
+from maze import DIRECTION_DELTAS, Maze
+
+_FREE, _OPEN, _WALL = 0, 1, 2       # pin states for generator cells
+
+
+def generate(width, height, seed=None, wall_density=0.2, slides=None, enemies=0):
+    """Return a solvable LevelData of the given size.
+
+    slides is the length of the built-in solution chain (default scales with
+    the board); enemies is the number of patrol spawns to place.
+    """
+    if width < 4 or height < 4:
+        raise ValueError("maze must be at least 4x4")
+    rng = random.Random(seed)
+    w, h = width, height
+
+    # Random walls in one pass: map random bytes below the threshold to 1.
+    threshold = int(wall_density * 256)
+    table = bytes(1 if b < threshold else 0 for b in range(256))
+    rows = [bytearray(rng.randbytes(w).translate(table)) for _ in range(h)]
+    rows[0][:] = rows[-1][:] = b"\x01" * w
+    for row in rows:
+        row[0] = row[-1] = 1
+
+    n_slides = max(2, min(slides or max(6, (w + h) // 6), (w - 2) * (h - 2) - 1))
+    for _ in range(100):
+        chain = _lay_chain(rows, w, h, rng, n_slides)
+        if chain:
+            break
+    else:
+        raise RuntimeError("could not lay a solution chain; try a lower wall_density")
+
+    start = chain[0]
+    key = chain[len(chain) // 2]
+    goal = chain[-1]
+    return LevelData(rows, start, goal, key, _place_enemies(rows, w, h, rng, enemies, start))
+
+
+def generate_maze(width, height, seed=None, **kwargs):
+    return Maze.from_grid(*generate(width, height, seed, **kwargs))
+
+
+def _lay_chain(rows, w, h, rng, n_slides):
+    """Carve a chain of n_slides slides; returns the stop cells or None."""
+    pins = bytearray(w * h)
+    x, y = rng.randrange(1, w - 1), rng.randrange(1, h - 1)
+    undo = [(x, y, rows[y][x])]
+    rows[y][x] = 0
+    pins[y * w + x] = _OPEN
+    stops = [(x, y)]
+    max_len = max(2, min(w, h) // 3)
+    deltas = list(DIRECTION_DELTAS.values())
+
+    for _ in range(n_slides):
+        for _attempt in range(20):
+            dx, dy = rng.choice(deltas)
+            length = rng.randint(1, max_len)
+            ex, ey = x + dx * length, y + dy * length
+            sx, sy = ex + dx, ey + dy               # stopper just past the end
+            if not (0 < ex < w - 1 and 0 < ey < h - 1) or (ex, ey) in stops:
+                continue
+            if pins[sy * w + sx] == _OPEN:
+                continue
+            if any(pins[(y + dy * i) * w + x + dx * i] == _WALL for i in range(1, length + 1)):
+                continue
+            for i in range(1, length + 1):
+                cx, cy = x + dx * i, y + dy * i
+                undo.append((cx, cy, rows[cy][cx]))
+                rows[cy][cx] = 0
+                pins[cy * w + cx] = _OPEN
+            undo.append((sx, sy, rows[sy][sx]))
+            rows[sy][sx] = 1
+            pins[sy * w + sx] = _WALL
+            x, y = ex, ey
+            stops.append((x, y))
+            break
+        else:
+            for cx, cy, v in reversed(undo):         # stuck: restore and retry
+                rows[cy][cx] = v
+            return None
+    return stops
+
+
+def _place_enemies(rows, w, h, rng, count, start):
+    spawns = []
+    deltas = list(DIRECTION_DELTAS.values())
+    tries = 0
+    while len(spawns) < count and tries < count * 50:
+        tries += 1
+        x, y = rng.randrange(1, w - 1), rng.randrange(1, h - 1)
+        if rows[y][x] or (x, y) == start:
+            continue
+        open_dirs = [(dx, dy) for dx, dy in deltas if not rows[y + dy][x + dx]]
+        if open_dirs:
+            spawns.append((x, y) + rng.choice(open_dirs))
+    return spawns
+
+
+def main(argv=None):
+    import levels
+
+    parser = argparse.ArgumentParser(description="Generate a solvable ice maze level file.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--wall-density", type=float, default=0.2)
+    parser.add_argument("--slides", type=int, default=None, help="length of the built-in solution")
+    parser.add_argument("--enemies", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True, help="*.mazeb for binary, else text")
+    args = parser.parse_args(argv)
+
+    maze = generate_maze(args.width, args.height, args.seed, wall_density=args.wall_density,
+                         slides=args.slides, enemies=args.enemies)
+    levels.save(maze, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
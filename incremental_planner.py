@@ -0,0 +1,291 @@
+"""Replan after the maze changes without starting over: D* Lite over slide states (no pygame needed).
+
+    planner = IncrementalPlanner(maze)
+    planner.path()                    # shortest key-then-goal path from the start
+    planner.set_cell(7, 3, wall=True)
+    planner.path()                    # repaired, usually touching a handful of states
+    planner.move_to((4, 3), has_key=True)
+
+    python incremental_planner.py --size 512 --changes 200 --check
+
+The search runs backwards from Echo Base and keeps every state's distance
+(g) and one-step lookahead (rhs). Toggling a cell patches only the slides of
+its row and column span (Maze.set_cell), and only states whose lookahead
+those edges feed are queued again, so the cost of a repair follows the
+size of the change rather than the size of the board. A change that cuts
+the current route is the expensive case: every state whose best route ran
+through the cut is raised and re-lowered, which can cost more than a fresh
+search.
+"""
+import argparse
+from array import array
+import heapq
+import random
+import statistics
+import sys
+import time
+
+from maze import DIRECTIONS
+
+INF = 1 << 30
+
+
+class IncrementalPlanner:
+    """D* Lite (Koenig & Likhachev) on (cell, has_key) states of the raw grid.
+
+    States are packed like the search engines', cell*2 + has_key, except
+    that the flag is already set on the key cell itself. Edges come straight
+    from maze.slides, and predecessors are read off the slide table too: a
+    slide left ends at v exactly when v's left neighbour is a wall, and then
+    it comes from every cell up to v's own right stop. So nothing has to be
+    rebuilt when the grid changes. Change cells through set_cell() (or call
+    cells_changed() with what Maze.set_cell returned).
+    """
+    def __init__(self, maze, start=None, has_key=False, goal=None, key_pos=None):
+        self.maze = maze
+        w = maze.width
+        goal = maze.goal_pos if goal is None else goal
+        key_pos = maze.key_pos if key_pos is None else key_pos
+        self.goal_c = goal[1] * w + goal[0]
+        self.key_c = -1 if key_pos is None else key_pos[1] * w + key_pos[0]
+        maze.slides                                  # build before the first lookup
+
+        n = 2 * w * maze.height
+        self.g = array('i', [INF]) * n
+        self.rhs = array('i', [INF]) * n
+        self._heap = []
+        self._queued = {}                            # state -> key it is queued under
+        self.km = 0
+        self.nodes_expanded = 0                      # states expanded by the last repair
+
+        self.target = self.goal_c * 2 + 1
+        self.rhs[self.target] = 0
+        start = maze.start_pos if start is None else start
+        self.start = self._state(start, has_key)
+        self._last = self.start
+        self._push(self.target)
+
+    # ---------- states ----------
+    def _state(self, pos, has_key):
+        cell = pos[1] * self.maze.width + pos[0]
+        return cell * 2 + (1 if (has_key or cell == self.key_c) else 0)
+
+    def _h(self, a, b):
+        """Slide lower bound between the cells of states a and b (see SearchAlgorithm._slide_heuristic)."""
+        a, b = a >> 1, b >> 1
+        if a == b:
+            return 0
+        w = self.maze.width
+        return 1 if (a % w == b % w or a // w == b // w) else 2
+
+    def _key(self, st):
+        m = min(self.g[st], self.rhs[st])
+        return (m + self._h(self.start, st) + self.km, m)
+
+    def _push(self, st):
+        key = self._key(st)
+        self._queued[st] = key
+        heapq.heappush(self._heap, (key[0], key[1], st))
+
+    def _successors(self, st):
+        slides = self.maze.slides
+        cur, has_key = st >> 1, st & 1
+        base = cur * 4
+        for d in range(4):
+            nb = slides[base + d]
+            if nb < 0 or (nb == self.goal_c and not has_key):
+                continue
+            yield d, nb * 2 + (1 if (has_key or nb == self.key_c) else 0)
+
+    def _predecessors(self, st):
+        v, has_key = st >> 1, st & 1
+        if v == self.goal_c and not has_key:
+            return                                   # the goal is never entered keyless
+        slides = self.maze.slides
+        w = self.maze.width
+        b = v * 4
+        cells = []
+        if slides[b + 2] < 0 and slides[b + 3] >= 0:     # slides left from the span to the right
+            cells.append(range(v + 1, slides[b + 3] + 1))
+        if slides[b + 3] < 0 and slides[b + 2] >= 0:     # slides right from the span to the left
+            cells.append(range(slides[b + 2], v))
+        if slides[b] < 0 and slides[b + 1] >= 0:         # slides up from below
+            cells.append(range(v + w, slides[b + 1] + 1, w))
+        if slides[b + 1] < 0 and slides[b] >= 0:         # slides down from above
+            cells.append(range(slides[b], v, w))
+        key_c = self.key_c
+        for span in cells:
+            for u in span:
+                if has_key:
+                    yield u * 2 + 1
+                    if v == key_c and u != key_c:
+                        yield u * 2                  # arriving on the key picks it up
+                elif u != key_c:
+                    yield u * 2
+
+    # ---------- D* Lite ----------
+    def _lookahead(self, st):
+        """rhs of st: one slide plus the best successor's g."""
+        if st == self.target:
+            return 0
+        g = self.g
+        best = INF
+        for _, nst in self._successors(st):
+            if g[nst] + 1 < best:
+                best = g[nst] + 1
+        return best
+
+    def _requeue(self, st):
+        self._queued.pop(st, None)
+        if self.g[st] != self.rhs[st]:
+            self._push(st)
+
+    def _update(self, st):
+        self.rhs[st] = self._lookahead(st)
+        self._requeue(st)
+
+    def _top(self):
+        heap, queued = self._heap, self._queued
+        while heap:
+            k1, k2, st = heap[0]
+            if queued.get(st) == (k1, k2):
+                return (k1, k2), st
+            heapq.heappop(heap)                      # stale entry
+        return None, -1
+
+    def _compute(self):
+        """The optimized ComputeShortestPath of D* Lite."""
+        g, rhs = self.g, self.rhs
+        start = self.start
+        expanded = 0
+        while True:
+            key, st = self._top()
+            if key is None or (key >= self._key(start) and rhs[start] == g[start]):
+                break
+            new_key = self._key(st)
+            if key < new_key:
+                self._push(st)
+                continue
+            heapq.heappop(self._heap)
+            del self._queued[st]
+            expanded += 1
+            if g[st] > rhs[st]:
+                # became cheaper: predecessors can only improve through st
+                g[st] = rhs[st]
+                via = g[st] + 1
+                for p in self._predecessors(st):
+                    if via < rhs[p]:
+                        rhs[p] = via
+                        self._requeue(p)
+            else:
+                # became dearer: recheck whoever relied on st, and st itself
+                via = g[st] + 1
+                g[st] = INF
+                self._update(st)
+                for p in self._predecessors(st):
+                    if rhs[p] == via:
+                        self._update(p)
+        self.nodes_expanded = expanded
+
+    # ---------- public ----------
+    def cells_changed(self, cells):
+        """Queue the states whose outgoing slides changed (flat cells, as from Maze.set_cell)."""
+        key_c = self.key_c
+        for c in cells:
+            self._update(c * 2 + 1)
+            if c != key_c:
+                self._update(c * 2)
+
+    def set_cell(self, x, y, wall):
+        """Toggle a cell through Maze.set_cell and queue the affected states; returns the changed cells."""
+        changed = self.maze.set_cell(x, y, wall)
+        self.cells_changed(changed)
+        return changed
+
+    def move_to(self, pos, has_key=False):
+        """The pilot now stands at pos; later paths start there."""
+        self.start = self._state(pos, has_key)
+        self.km += self._h(self._last, self.start)
+        self._last = self.start
+
+    def distance(self):
+        """Fewest slides from the current start to Echo Base, or -1."""
+        self._compute()
+        d = self.g[self.start]
+        return -1 if d >= INF else d
+
+    def next_move(self):
+        """(direction, stop position) of an optimal first slide, or None."""
+        if self.distance() <= 0:
+            return None
+        d, nst = self._best_successor(self.start)
+        w = self.maze.width
+        return DIRECTIONS[d], ((nst >> 1) % w, (nst >> 1) // w)
+
+    def _best_successor(self, st):
+        g = self.g
+        best = None
+        for d, nst in self._successors(st):
+            if best is None or g[nst] < g[best[1]]:
+                best = (d, nst)
+        return best
+
+    def path(self):
+        """Shortest list of positions from the current start to Echo Base, or []."""
+        n = self.distance()
+        if n < 0:
+            return []
+        w = self.maze.width
+        st = self.start
+        cell = st >> 1
+        path = [(cell % w, cell // w)]
+        for _ in range(n):
+            st = self._best_successor(st)[1]
+            path.append(((st >> 1) % w, (st >> 1) // w))
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time D* Lite repairs after random single-cell changes.")
+    parser.add_argument("--size", type=int, default=256, help="generated maze width and height")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--changes", type=int, default=200, help="random cells to toggle")
+    parser.add_argument("--check", action="store_true", help="compare every repair with a fresh BFS")
+    args = parser.parse_args(argv)
+
+    from generator import generate_maze
+    from search import SearchAlgorithm
+    maze = generate_maze(args.size, args.size, args.seed)
+    t0 = time.perf_counter()
+    planner = IncrementalPlanner(maze)
+    slides = planner.distance()
+    print(f"{args.size}x{args.size}: first plan {slides} slides in {(time.perf_counter() - t0) * 1000:.1f} ms "
+          f"({planner.nodes_expanded} states)")
+
+    rng = random.Random(args.seed)
+    fixed = {maze.start_pos, maze.goal_pos, maze.key_pos}
+    times, expanded, mismatches = [], [], 0
+    for _ in range(args.changes):
+        x, y = rng.randrange(1, args.size - 1), rng.randrange(1, args.size - 1)
+        if (x, y) in fixed:
+            continue
+        t0 = time.perf_counter()
+        planner.set_cell(x, y, maze.grid[y][x] != 1)
+        slides = planner.distance()
+        times.append(time.perf_counter() - t0)
+        expanded.append(planner.nodes_expanded)
+        if args.check:
+            search = SearchAlgorithm(maze, trace=False)
+            found = search.bfs_with_key(maze.start_pos, maze.goal_pos, maze.key_pos)
+            mismatches += slides != (len(search.path) - 1 if found else -1)
+    times.sort()
+    print(f"{len(times)} repairs: median {statistics.median(times) * 1000:.2f} ms, "
+          f"p90 {times[int(len(times) * 0.9)] * 1000:.2f} ms, max {times[-1] * 1000:.2f} ms, "
+          f"median {statistics.median(expanded)} states expanded")
+    if args.check:
+        print(f"{mismatches} mismatches against bfs_with_key")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Where solve time and frame time go: search stats and per-stage frame timings (no pygame needed).
+
+    stats = profile_search(SearchAlgorithm(maze), "bfs", start, goal, key)
+    profiler = FrameProfiler(enabled=True)
+    running = profiler.time("handle_events", game.handle_events)
+    profiler.export("frames.csv")            # or .json
+
+A disabled FrameProfiler costs one attribute check per timed call.
+"""
+from collections import deque
+import csv
+import json
+from time import perf_counter
+import tracemalloc
+
+
+def search_stats(search, found, wall, peak_bytes=None):
+    """JSON-friendly costs of a finished search that took `wall` seconds."""
+    return {
+        "algorithm": search.algorithm_used,
+        "found": bool(found),
+        "wall_ms": round(wall * 1000, 3),
+        "nodes_expanded": search.nodes_expanded,
+        "nodes_per_sec": round(search.nodes_expanded / wall) if wall > 0 else None,
+        "peak_frontier": search.peak_frontier,
+        "duplicate_hits": search.duplicate_hits,
+        "degraded": search.degraded,
+        "peak_mem_kb": None if peak_bytes is None else round(peak_bytes / 1024, 1),
+    }
+
+
+def profile_search(search, algorithm, start, goal, key_pos, has_key_start=False, memory=True, **options):
+    """Run search.solve(...) (options go to the engine) and return search_stats for it.
+
+    memory=True traces allocations with tracemalloc for peak_mem_kb, which
+    slows the search down; the wall time is then not representative.
+    """
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    elif memory:
+        tracemalloc.reset_peak()
+    try:
+        t0 = perf_counter()
+        found = search.solve(algorithm, start, goal, key_pos, has_key_start, **options)
+        wall = perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+    finally:
+        if started:
+            tracemalloc.stop()
+    return search_stats(search, found, wall, peak)
+
+
+class FrameProfiler:
+    """Per-frame stage timings (ms) over the last `history` frames, plus search stats.
+
+    Stages are whatever names are passed to time()/record(); a frame's
+    "frame" entry is the time from begin_frame() to end_frame().
+    """
+    def __init__(self, enabled=False, history=600):
+        self.enabled = enabled
+        self.frames = deque(maxlen=history)
+        self.searches = []
+        self.stages = []             # stage names in first-seen order
+        self._current = None
+        self._frame_start = 0.0
+
+    def begin_frame(self):
+        if self.enabled:
+            self._current = {}
+            self._frame_start = perf_counter()
+
+    def end_frame(self):
+        if self.enabled and self._current is not None:
+            self._current["frame"] = (perf_counter() - self._frame_start) * 1000
+            self.frames.append(self._current)
+            self._current = None
+
+    def record(self, stage, ms):
+        if self._current is None:
+            return
+        if stage not in self.stages:
+            self.stages.append(stage)
+        self._current[stage] = self._current.get(stage, 0.0) + ms
+
+    def time(self, stage, fn, *args):
+        """Call fn(*args), adding its duration to `stage` when enabled."""
+        if not self.enabled:
+            return fn(*args)
+        t0 = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.record(stage, (perf_counter() - t0) * 1000)
+
+    def add_search(self, stats):
+        if self.enabled:
+            self.searches.append(stats)
+
+    def clear(self):
+        self.frames.clear()
+        self.searches.clear()
+
+    def summary(self):
+        """{stage: (last_ms, mean_ms, max_ms)} over the recorded frames."""
+        out = {}
+        for stage in self.stages + ["frame"]:
+            values = [f[stage] for f in self.frames if stage in f]
+            if values:
+                out[stage] = (values[-1], sum(values) / len(values), max(values))
+        return out
+
+    def export(self, path):
+        """Write frames and searches as JSON, or as CSV (frames, plus <name>-searches.csv)."""
+        columns = self.stages + ["frame"]
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for frame in self.frames:
+                    writer.writerow([round(frame.get(c, 0.0), 4) for c in columns])
+            if self.searches:                # frames.csv -> frames-searches.csv
+                with open(path[:-4] + "-searches.csv", "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=list(self.searches[0]))
+                    writer.writeheader()
+                    writer.writerows(self.searches)
+        else:
+            with open(path, "w") as f:
+                json.dump({
+                    "summary_ms": {k: {"last": round(v[0], 4), "mean": round(v[1], 4), "max": round(v[2], 4)}
+                                   for k, v in self.summary().items()},
+                    "frames": [{c: round(frame.get(c, 0.0), 4) for c in columns} for frame in self.frames],
+                    "searches": self.searches,
+                }, f, indent=1)
@@ -0,0 +1,169 @@
+"""Level files: a readable text form and a packed binary form.
+
+Text (``.maze``)::
+
+    # comments start with '#'
+    size 16 10
+    start 1 1
+    goal 14 8
+    key 1 5
+    enemy 3 7 1 0          # x y dx dy, one line per patrol
+    grid
+    ################
+    #....#....#....#
+    ...
+
+``#`` is a wall and ``.`` is ice. Binary (``.mazeb``) is a little-endian
+header (see _HEADER) followed by the enemy spawns as int32 quadruples and
+then width*height grid bytes, one byte per cell (1 = wall), row-major.
+load_binary maps the file with mmap and hands Maze one memoryview per row,
+so opening even a 4096x4096 board does no per-cell parsing.
+
+    python levels.py export 3 level3.mazeb
+    python levels.py convert level3.mazeb level3.maze
+"""
+from collections import namedtuple
+import mmap
+import struct
+import sys
+
+LevelData = namedtuple("LevelData", "grid start goal key enemy_spawns")
+
+MAGIC = b"ICEM"
+VERSION = 1
+# magic, version, width, height, start x/y, goal x/y, key x/y (-1 = none), enemies
+_HEADER = struct.Struct("<4sHIIiiiiiiI")
+_ENEMY = struct.Struct("<iiii")
+
+WALL_CHAR, ICE_CHAR = "#", "."
+
+
+def _key_or_none(x, y):
+    return None if x < 0 else (x, y)
+
+
+def load(path):
+    """Load a text or binary level file, picked by its first bytes."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+    return load_binary(path) if head == MAGIC else load_text(path)
+
+
+# ---------- text ----------
+def load_text(path):
+    start = goal = key = None
+    enemies, rows = [], []
+    width = height = None
+    with open(path) as f:
+        in_grid = False
+        for n, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if in_grid:
+                if line.strip():
+                    rows.append([1 if ch == WALL_CHAR else 0 for ch in line.strip()])
+                continue
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            word, *args = line.split()
+            if word == "grid":
+                in_grid = True
+                continue
+            try:
+                nums = [int(a) for a in args]
+            except ValueError:
+                raise ValueError(f"{path}:{n}: expected integers after {word!r}") from None
+            if word == "size":
+                width, height = nums
+            elif word == "start":
+                start = tuple(nums)
+            elif word == "goal":
+                goal = tuple(nums)
+            elif word == "key":
+                key = tuple(nums)
+            elif word == "enemy":
+                enemies.append(tuple(nums))
+            else:
+                raise ValueError(f"{path}:{n}: unknown directive {word!r}")
+
+    if start is None or goal is None or not rows:
+        raise ValueError(f"{path}: level needs start, goal and a grid")
+    if width is not None and (len(rows) != height or any(len(r) != width for r in rows)):
+        raise ValueError(f"{path}: grid does not match size {width}x{height}")
+    return LevelData(rows, start, goal, key, enemies)
+
+
+def save_text(maze, path):
+    lines = [
+        f"size {maze.width} {maze.height}",
+        "start %d %d" % maze.start_pos,
+        "goal %d %d" % maze.goal_pos,
+    ]
+    if maze.key_pos is not None:
+        lines.append("key %d %d" % maze.key_pos)
+    lines += ["enemy %d %d %d %d" % tuple(e) for e in maze.enemy_spawns]
+    lines.append("grid")
+    lines += ["".join(WALL_CHAR if c == 1 else ICE_CHAR for c in row) for row in maze.grid]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ---------- binary ----------
+def load_binary(path):
+    """Map a binary level; grid rows are memoryviews into the mapping.
+
+    The mapping is copy-on-write, so edits to the grid stay in memory and
+    never reach the file.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    (magic, version, w, h, sx, sy, gx, gy, kx, ky, n_enemies) = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} binary level")
+    offset = _HEADER.size
+    enemies = [_ENEMY.unpack_from(mm, offset + i * _ENEMY.size) for i in range(n_enemies)]
+    offset += n_enemies * _ENEMY.size
+    if len(mm) < offset + w * h:
+        raise ValueError(f"{path}: truncated grid")
+    cells = memoryview(mm)[offset:offset + w * h]
+    rows = [cells[y * w:(y + 1) * w] for y in range(h)]
+    return LevelData(rows, (sx, sy), (gx, gy), _key_or_none(kx, ky), enemies)
+
+
+def save_binary(maze, path):
+    kx, ky = maze.key_pos if maze.key_pos is not None else (-1, -1)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, maze.width, maze.height,
+                             *maze.start_pos, *maze.goal_pos, kx, ky, len(maze.enemy_spawns)))
+        for e in maze.enemy_spawns:
+            f.write(_ENEMY.pack(*e))
+        for row in maze.grid:
+            f.write(bytes(row))
+
+
+def save(maze, path):
+    """Write binary for *.mazeb paths, text otherwise."""
+    (save_binary if str(path).endswith(".mazeb") else save_text)(maze, path)
+
+
+def main(argv=None):
+    import argparse
+    from maze import Maze
+
+    parser = argparse.ArgumentParser(description="Export or convert ice maze level files.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", help="write a built-in level to a file")
+    p.add_argument("level", type=int, choices=range(1, 6))
+    p.add_argument("path")
+    p = sub.add_parser("convert", help="convert between text and binary")
+    p.add_argument("src")
+    p.add_argument("dst")
+    args = parser.parse_args(argv)
+
+    maze = Maze(args.level) if args.cmd == "export" else Maze.from_file(args.src)
+    save(maze, args.path if args.cmd == "export" else args.dst)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
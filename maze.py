@@ -0,0 +1,321 @@
+"""Ice maze model: level data and slide physics (no pygame needed)."""
+from array import array
+import re
+
+# Slide directions; the index into DIRECTIONS is the slot used by Maze.slides
+DIRECTIONS = ('up', 'down', 'left', 'right')
+DIRECTION_DELTAS = {'up':(0,-1),'down':(0,1),'left':(-1,0),'right':(1,0)}
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+# A maximal run of non-wall cells in a row/column of grid bytes
+_OPEN_RUN = re.compile(rb'[^\x01]+')
+
+# ---------------------------
+# Maze (MULTI-LEVEL)
+# ---------------------------
+class Maze:
+    """Maze with 5 levels and a collectible key each level"""
+    def __init__(self, level=1):
+        self.level = level
+        self.key_collected = False
+        self.key_pos = None
+        self.enemy_spawns = []
+        self.load_level(level)
+
+    def load_level(self, level):
+        self.level = level
+        self.key_collected = False
+        self.enemy_spawns = []
+
+        if level == 1:
+            # 12 x 9
+            self.grid = [
+                [1,1,1,1,1,1,1,1,1,1,1,1],
+                [1,0,0,0,1,0,0,0,0,0,0,1],
+                [1,0,1,0,1,0,1,1,1,0,0,1],
+                [1,0,0,0,0,0,0,0,1,0,0,1],
+                [1,1,1,0,1,1,0,0,0,0,1,1],
+                [1,0,0,0,0,0,0,1,0,0,0,1],
+                [1,0,1,1,0,1,0,1,0,1,0,1],
+                [1,0,0,0,0,0,0,0,0,0,0,1],
+                [1,1,1,1,1,1,1,1,1,1,1,1]
+            ]
+            self.start_pos = (1, 1)
+            self.goal_pos  = (10, 7)
+            self.key_pos   = (5, 3)
+            self.enemy_spawns = []  # no enemies on level 1
+
+        elif level == 2:
+            # 12 x 9 — harder than 1; side trip to key
+            self.grid = [
+                [1,1,1,1,1,1,1,1,1,1,1,1],
+                [1,0,0,0,1,0,0,0,1,0,0,1],
+                [1,0,1,0,1,0,1,0,1,0,0,1],
+                [1,0,1,0,0,0,1,0,0,1,0,1],
+                [1,0,1,1,1,0,1,1,0,1,0,1],
+                [1,0,0,0,0,0,0,1,0,0,0,1],
+                [1,1,0,1,1,1,0,1,1,1,0,1],
+                [1,0,0,0,0,0,0,0,0,0,0,1],
+                [1,1,1,1,1,1,1,1,1,1,1,1]
+            ]
+            self.start_pos = (1, 1)
+            self.goal_pos  = (10, 7)
+            self.key_pos   = (9, 2)
+            # (x, y, dx, dy) patrols (move 1 tile, bounce)
+            self.enemy_spawns = [
+                (2, 7, 1, 0),   # bottom corridor
+                (5, 1, 0, 1),   # mid-right vertical shaft
+            ]
+
+        elif level == 3:
+            # 12 x 9 — hardest of small boards
+            self.grid = [
+                [1,1,1,1,1,1,1,1,1,1,1,1],
+                [1,0,0,1,0,0,0,1,1,0,0,1],
+                [1,0,1,0,0,1,0,1,1,0,1,1],
+                [1,0,1,0,0,0,0,0,1,0,0,1],
+                [1,0,0,0,1,1,1,0,1,1,0,1],
+                [1,1,1,0,0,0,1,0,0,1,0,1],
+                [1,0,0,0,1,0,1,1,0,1,0,1],
+                [1,0,0,0,0,0,0,0,0,0,0,1],
+                [1,1,1,0,1,1,1,1,1,1,1,1]
+            ]
+            self.start_pos = (1, 7)
+            self.goal_pos  = (10, 1)
+            self.key_pos   = (4, 1)
+            self.enemy_spawns = [
+                (3, 3, 1, 0),
+                (9, 6, 0, -1),
+                (6, 5, -1, 0),
+            ]
+
+        elif level == 4:
+            # 16 x 10 — bigger & tougher, still fair
+            self.grid = [
+                [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
+                [1,0,0,0,0,1,0,0,0,0,1,0,0,0,0,1],
+                [1,0,1,1,0,1,0,1,1,0,1,0,1,1,0,1],
+                [1,0,0,1,0,0,0,1,0,0,0,0,1,0,0,1],
+                [1,1,0,1,1,1,0,1,0,1,1,0,1,0,1,1],
+                [1,0,0,0,0,0,0,1,0,0,0,0,1,0,0,1],
+                [1,0,1,1,0,1,0,1,1,1,0,1,1,1,0,1],
+                [1,0,0,0,0,0,0,0,0,1,0,0,0,0,0,1],
+                [1,0,1,1,1,1,1,1,0,1,1,1,1,1,0,1],
+                [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
+            ]
+            self.start_pos = (1, 1)
+            self.goal_pos  = (14, 8)
+            self.key_pos   = (1, 5)
+            self.enemy_spawns = [
+                (3, 7, 1, 0),   # long bottom-ish lane
+                (12, 2, 0, 1),  # right column up↕down
+                (7, 5, -1, 0),  # middle lane
+            ]
+
+        else:  # level 5 — biggest and hardest
+            # 16 x 10
+            self.grid = [
+                [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
+                [1,0,0,0,1,0,0,0,0,1,0,0,0,0,0,1],
+                [1,0,1,0,1,0,1,1,0,1,0,1,1,1,0,1],
+                [1,0,1,0,0,0,0,1,0,0,0,0,1,0,0,1],
+                [1,0,1,1,1,1,0,1,1,1,1,0,1,0,1,1],
+                [1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,1],
+                [1,1,1,0,1,1,1,1,0,1,1,0,1,1,0,1],
+                [1,0,0,0,0,0,0,0,0,1,0,0,0,0,0,1],
+                [1,0,1,1,1,1,1,1,0,1,1,1,1,1,0,1],
+                [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
+            ]
+            self.start_pos = (1, 8)
+            self.goal_pos  = (14, 1)
+            self.key_pos   = (6, 3)
+            self.enemy_spawns = [
+                (4, 5, 1, 0),
+                (10, 3, 0, 1),
+                (13, 7, -1, 0),
+                (8, 1, 0, 1),
+            ]
+
+        self.terrain_type = "ice"
+        self.build_slide_table()
+
+    @classmethod
+    def from_grid(cls, grid, start_pos, goal_pos, key_pos, enemy_spawns=(), level=0):
+        """Build a maze from an explicit grid instead of a built-in level."""
+        maze = cls.__new__(cls)
+        maze.load_grid(grid, start_pos, goal_pos, key_pos, enemy_spawns, level)
+        return maze
+
+    def load_grid(self, grid, start_pos, goal_pos, key_pos, enemy_spawns=(), level=0):
+        """Use an explicit grid (any sequence of rows indexable as grid[y][x]).
+
+        The slide table is built on first use, so large grids load instantly.
+        """
+        self.level = level
+        self.key_collected = False
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.start_pos = tuple(start_pos)
+        self.goal_pos = tuple(goal_pos)
+        self.key_pos = tuple(key_pos) if key_pos is not None else None
+        self.enemy_spawns = [tuple(e) for e in enemy_spawns]
+        self.terrain_type = "ice"
+        self._slides = None
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a level file (text or binary, see levels.py)."""
+        import levels
+        data = levels.load(path)
+        return cls.from_grid(data.grid, data.start, data.goal, data.key, data.enemy_spawns)
+
+    @property
+    def slides(self):
+        if self._slides is None:
+            self.build_slide_table()
+        return self._slides
+
+    def build_slide_table(self):
+        """Precompute where a slide from every open cell stops.
+
+        slides[(y*width + x)*4 + d] is the flat index (y*width + x) of the stop
+        cell for DIRECTIONS[d], or -1 if that move is blocked straight away.
+        Every open run of a row or column shares one stop cell per direction,
+        so each run is written with a single strided slice assignment.
+        Call again after editing self.grid, or edit it through set_cell().
+        """
+        grid = self.grid
+        self.height = h = len(grid)
+        self.width = w = len(grid[0])
+        flat = b"".join(bytes(row) for row in grid)
+        slides = array('i', [-1]) * (w * h * 4)
+
+        for y in range(h):
+            for run in _OPEN_RUN.finditer(flat, y * w, (y + 1) * w):
+                a, b = run.start(), run.end() - 1          # flat cells
+                n = b - a
+                if n:
+                    slides[(a + 1) * 4 + 2:(b + 1) * 4 + 2:4] = array('i', [a]) * n  # left
+                    slides[a * 4 + 3:b * 4 + 3:4] = array('i', [b]) * n              # right
+
+        stride = w * 4
+        for x in range(w):
+            for run in _OPEN_RUN.finditer(flat[x::w]):
+                top = run.start() * w + x
+                bottom = (run.end() - 1) * w + x
+                n = run.end() - 1 - run.start()
+                if n:
+                    slides[(top + w) * 4:(bottom + w) * 4:stride] = array('i', [top]) * n  # up
+                    slides[top * 4 + 1:bottom * 4 + 1:stride] = array('i', [bottom]) * n  # down
+
+        self._slides = slides
+
+    def set_cell(self, x, y, wall):
+        """Make (x, y) a wall or open ice and patch only the slides it affects.
+
+        Only the open span of row y and of column x through the cell can
+        change, so the cost is their length, not the board's. Returns the
+        flat cells whose slide entries changed (their outgoing edges).
+        """
+        value = 1 if wall else 0
+        slides = self.slides                 # patch an up-to-date table
+        if self.grid[y][x] == value:
+            return []
+        self.grid[y][x] = value
+        w, h = self.width, self.height
+        grid = self.grid
+
+        lo, hi = x, x
+        while lo > 0 and grid[y][lo - 1] != 1:
+            lo -= 1
+        while hi < w - 1 and grid[y][hi + 1] != 1:
+            hi += 1
+        changed = set()
+        self._patch_line(slides, [y * w + i for i in range(lo, hi + 1)], 2, 3, changed)
+
+        lo, hi = y, y
+        while lo > 0 and grid[lo - 1][x] != 1:
+            lo -= 1
+        while hi < h - 1 and grid[hi + 1][x] != 1:
+            hi += 1
+        self._patch_line(slides, [j * w + x for j in range(lo, hi + 1)], 0, 1, changed)
+        return sorted(changed)
+
+    def _patch_line(self, slides, line, back, fwd, changed):
+        """Rewrite the back/fwd slots for consecutive cells of one row or column."""
+        w = self.width
+        run = []
+        for c in line + [-1]:
+            if c >= 0 and self.grid[c // w][c % w] != 1:
+                run.append(c)
+                continue
+            if run:
+                first, last = run[0], run[-1]
+                for r in run:
+                    for slot, stop in ((r * 4 + back, first), (r * 4 + fwd, last)):
+                        stop = -1 if stop == r else stop
+                        if slides[slot] != stop:
+                            slides[slot] = stop
+                            changed.add(r)
+                run = []
+            if c >= 0:                       # the new wall: no slides from it
+                for slot in (c * 4 + back, c * 4 + fwd):
+                    if slides[slot] != -1:
+                        slides[slot] = -1
+                        changed.add(c)
+
+    def slide_sources(self, c):
+        """Flat cells whose slide stops at cell c, read off the slide table.
+
+        A slide left ends at c exactly when c's left neighbour blocks it, and
+        it then comes from every cell up to c's own right stop; likewise for
+        the other directions. So the reverse graph needs no index of its own
+        and stays current through set_cell().
+        """
+        slides = self.slides
+        w = self.width
+        b = c * 4
+        up, down, left, right = slides[b], slides[b + 1], slides[b + 2], slides[b + 3]
+        sources = []
+        if left < 0 and right >= 0:
+            sources += range(c + 1, right + 1)
+        if right < 0 and left >= 0:
+            sources += range(left, c)
+        if up < 0 and down >= 0:
+            sources += range(c + w, down + 1, w)
+        if down < 0 and up >= 0:
+            sources += range(up, c, w)
+        return sources
+
+    def is_wall(self, x, y):
+        if 0 <= y < len(self.grid) and 0 <= x < len(self.grid[0]):
+            return self.grid[y][x] == 1
+        return True
+
+    def slide_move(self, start_x, start_y, direction):
+        d = DIRECTION_INDEX.get(direction)
+        if d is None or not (0 <= start_x < self.width and 0 <= start_y < self.height):
+            return None
+        stop = self.slides[(start_y * self.width + start_x) * 4 + d]
+        if stop < 0:
+            return None
+        return (stop % self.width, stop // self.width)
+
+    def collect_key(self, player_pos):
+        if not self.key_collected and player_pos == self.key_pos:
+            self.key_collected = True
+            return True
+        return False
+
+    def can_exit(self, player_pos):
+        return self.key_collected and player_pos == self.goal_pos
+
+    def get_level_name(self):
+        return {
+            1:"Hoth Landing Site",
+            2:"Ice Caverns",
+            3:"Echo Base Approach",
+            4:"Frozen Wastes",
+            5:"Shield Generator Run",
+        }.get(self.level, "Uncharted Sector")
@@ -0,0 +1,162 @@
+"""Deterministic patrol motion and per-tick occupancy (no pygame needed).
+
+A patrol is (x, y, dx, dy). Every enemy tick it moves one cell, bouncing off
+walls; the game and the planners both step patrols with step_patrol so their
+timelines agree exactly.
+"""
+from array import array
+import math
+
+
+def step_patrol(maze, x, y, dx, dy):
+    """Return the patrol state after one tick."""
+    nx, ny = x + dx, y + dy
+    if maze.is_wall(nx, ny):
+        dx, dy = -dx, -dy
+        nx, ny = x + dx, y + dy
+        if maze.is_wall(nx, ny):
+            for tdx, tdy in [(1,0), (-1,0), (0,1), (0,-1)]:
+                if not maze.is_wall(x + tdx, y + tdy):
+                    return (x + tdx, y + tdy, tdx, tdy)
+            return (x, y, dx, dy)  # stuck
+    return (nx, ny, dx, dy)
+
+
+def patrol_cycle(maze, x, y, dx, dy):
+    """Return (states, cycle_start): states[i] is the state at tick i, and from
+    cycle_start on the list repeats forever."""
+    states, seen = [], {}
+    s = (x, y, dx, dy)
+    while s not in seen:
+        seen[s] = len(states)
+        states.append(s)
+        s = step_patrol(maze, *s)
+    return states, seen[s]
+
+
+class PatrolTable:
+    """Cells occupied by all patrols at every tick, folded onto one cycle.
+
+    Ticks 0..offset-1 are the lead-in before every patrol has entered its
+    cycle; after that the pattern repeats every `period` ticks, so the table
+    has offset + period rows and index(t) maps any tick onto a row.
+    """
+    def __init__(self, maze, enemies, max_length=1 << 20):
+        cycles = [patrol_cycle(maze, *e) for e in enemies]
+        self.offset = max((start for _, start in cycles), default=0)
+        self.period = math.lcm(*(len(states) - start for states, start in cycles)) if cycles else 1
+        self.length = self.offset + self.period
+        if self.length > max_length:
+            raise ValueError(f"patrol timeline of {self.length} ticks exceeds {max_length}")
+
+        w = maze.width
+        rows = []
+        for t in range(self.length):
+            cells = []
+            for states, start in cycles:
+                if t >= len(states):
+                    t_e = start + (t - start) % (len(states) - start)
+                else:
+                    t_e = t
+                x, y = states[t_e][0], states[t_e][1]
+                cells.append(y * w + x)
+            rows.append(tuple(cells))
+        self.cells = rows            # cells[i]: flat cells occupied at row i
+
+    def index(self, tick):
+        if tick < self.length:
+            return tick
+        return self.offset + (tick - self.offset) % self.period
+
+    def next_index(self, i):
+        return i + 1 if i + 1 < self.length else self.offset
+
+    def occupied(self, cell, tick):
+        return cell in self.cells[self.index(tick)]
+
+
+class PatrolSet:
+    """Every patrol of a level, stepped along cycles precomputed at load time.
+
+    Cycles are stored back to back in flat arrays (cell, dx, dy per tick), so
+    a step is one index bump per patrol with no wall probes. Two per-cell
+    counters answer "is this tile occupied now / next tick" in O(1).
+    """
+    def __init__(self, maze, spawns):
+        self.width = w = maze.width
+        n_cells = maze.width * maze.height
+        self.count = len(spawns)
+        self.tick = 0
+
+        self.seq_cell, self.seq_dx, self.seq_dy = array('i'), array('b'), array('b')
+        self.base = array('i')      # where each patrol's states begin in seq_*
+        self.size = array('i')      # states in its lead-in + cycle
+        self.loop = array('i')      # index its cycle restarts from
+        for spawn in spawns:
+            states, start = patrol_cycle(maze, *spawn)
+            self.base.append(len(self.seq_cell))
+            self.size.append(len(states))
+            self.loop.append(start)
+            for x, y, dx, dy in states:
+                self.seq_cell.append(y * w + x)
+                self.seq_dx.append(dx)
+                self.seq_dy.append(dy)
+
+        self.index = array('i', [0]) * self.count
+        self.cells = array('i', [self.seq_cell[b] for b in self.base])
+        self.next_cells = array('i', [self.seq_cell[self.base[i] + self._after(i, 0)]
+                                      for i in range(self.count)])
+        self.now = array('H', [0]) * n_cells
+        self.next = array('H', [0]) * n_cells
+        for c in self.cells:
+            self.now[c] += 1
+        for c in self.next_cells:
+            self.next[c] += 1
+
+    def _after(self, i, k):
+        k += 1
+        return k if k < self.size[i] else self.loop[i]
+
+    def step(self):
+        """Advance every patrol one tick."""
+        seq, base, index = self.seq_cell, self.base, self.index
+        size, loop = self.size, self.loop
+        cells, next_cells = self.cells, self.next_cells
+        now, nxt = self.now, self.next
+        for i in range(self.count):
+            k = index[i] + 1
+            if k == size[i]:
+                k = loop[i]
+            index[i] = k
+            k2 = k + 1
+            if k2 == size[i]:
+                k2 = loop[i]
+            now[cells[i]] -= 1
+            nxt[next_cells[i]] -= 1
+            cells[i] = c = next_cells[i]
+            next_cells[i] = c2 = seq[base[i] + k2]
+            now[c] += 1
+            nxt[c2] += 1
+        self.tick += 1
+
+    def occupied(self, x, y):
+        return self.now[y * self.width + x] > 0
+
+    def occupied_next(self, x, y):
+        return self.next[y * self.width + x] > 0
+
+    def positions(self):
+        w = self.width
+        return [(c % w, c // w) for c in self.cells]
+
+    def states(self):
+        """Current (x, y, dx, dy) of every patrol, e.g. for PatrolTable."""
+        w = self.width
+        out = []
+        for i, c in enumerate(self.cells):
+            k = self.base[i] + self.index[i]
+            out.append((c % w, c // w, self.seq_dx[k], self.seq_dy[k]))
+        return out
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,86 @@
+"""Bounded caches for surfaces the game would otherwise rebuild every frame."""
+from collections import OrderedDict
+
+import pygame
+
+
+class SurfaceCache:
+    """LRU cache of filled/alpha surfaces and rendered text.
+
+    Fonts are kept for the life of the cache (there are only a handful of
+    sizes); surfaces are evicted least-recently-used once more than
+    max_entries are held. Cached surfaces are shared, so callers must not
+    draw on them.
+    """
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self._fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, build):
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self._surfaces[key] = build()
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def filled(self, size, color, alpha=None):
+        """A surface of size filled with color, with optional per-surface alpha."""
+        def build():
+            s = pygame.Surface(size)
+            if alpha is not None:
+                s.set_alpha(alpha)
+            s.fill(color)
+            return s
+        return self._get(("fill", size, color, alpha), build)
+
+    def text(self, font, text, color):
+        """font.render(text, True, color), cached by font, text and color."""
+        return self._get(("text", font, text, color), lambda: font.render(text, True, color))
+
+    def wrapped(self, font, text, color, max_width):
+        """Soft-wrap text inside max_width; returns the rendered line surfaces."""
+        def build():
+            lines, line = [], ""
+            for w in text.split(' '):
+                test = (line + " " + w).strip()
+                if font.size(test)[0] <= max_width:
+                    line = test
+                else:
+                    lines.append(line)
+                    line = w
+            if line:
+                lines.append(line)
+            return [self.text(font, ln, color) for ln in lines]
+        return self._get(("wrap", font, text, color, max_width), build)
+
+    def title_fit(self, text, base_size, color, max_width):
+        """Title text at the largest size (down to 16) that fits max_width."""
+        def build():
+            size = base_size
+            while size >= 16:
+                surf = self.font(size).render(text, True, color)
+                if surf.get_width() <= max_width:
+                    return surf
+                size -= 2
+            return self.font(16).render(text, True, color)
+        return self._get(("title", text, base_size, color, max_width), build)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
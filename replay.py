@@ -0,0 +1,299 @@
+"""Compact binary replays of one level of play and fast headless verification (no pygame needed).
+
+    sim = Simulation(Maze(3), record=True)      # the game records with --record DIR
+    ...
+    data = encode(capture(sim))
+    verify(data)                                # {"ok": True, "expected": ..., "actual": ...}
+
+    python replay.py record --levels 1 2 3 4 5 --algorithm bfs spacetime -o replays
+    python replay.py verify replays/*.imr --workers 8
+
+A file is HEADER (level, generator seed and size, starting mode and the
+recorded outcome) followed by one record per input: ticks since the previous
+input as a varint, an opcode byte and its payload. Ticks without input cost
+nothing, so a long level is typically a few hundred bytes. Verification
+re-runs the inputs on a fresh Simulation at full speed and compares the
+status and tick count with the recorded ones.
+"""
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import glob
+import os
+import struct
+import sys
+import time
+
+from maze import DIRECTIONS, Maze
+from search import ENGINES
+from simulation import COMPLETE, GAME_OVER, RUNNING, Simulation, fly_autopilot
+
+MAGIC = b"IMRP"
+VERSION = 1
+# magic, version, flags, status, level, seed, width, height, enemies, ticks, input count
+HEADER = struct.Struct("<4sBBBHQIIIII")
+_MANUAL = 1                                # flags bit: the level started in human mode
+
+STATUSES = (RUNNING, COMPLETE, GAME_OVER)
+
+# opcodes: 0-3 move in DIRECTIONS order, then:
+_MANUAL_OFF, _MANUAL_ON, _THAW, _FREEZE, _AUTOPILOT, _TIMED_AUTOPILOT, _STOP = range(4, 11)
+
+Replay = namedtuple("Replay", "level seed width height enemies manual status ticks inputs")
+Replay.__doc__ = """One recorded level: width == 0 means built-in level `level`, otherwise
+generator.generate_maze(width, height, seed, enemies=enemies). inputs are
+Simulation.inputs entries, (tick, method name, args)."""
+
+
+def capture(sim, generated=None):
+    """Replay of sim, which must have been built with record=True.
+
+    generated is (seed, width, height, enemies) for a maze from generator.py.
+    The recorded outcome is sim's status and tick count right now.
+    """
+    if sim.inputs is None:
+        raise ValueError("simulation was not recording (use Simulation(..., record=True))")
+    seed, width, height, enemies = generated or (0, 0, 0, 0)
+    first_manual = sim.manual
+    for _, name, args in sim.inputs:
+        if name == "set_manual":
+            first_manual = not args[0]       # undo to the value the level started with
+            break
+    return Replay(sim.maze.level, seed, width, height, enemies, first_manual,
+                  sim.status, sim.tick_count, list(sim.inputs))
+
+
+# ---------- encoding ----------
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data, i):
+    n = shift = 0
+    while True:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def _zigzag(n):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -(n >> 1) - 1
+
+
+def encode(replay):
+    """bytes of a Replay."""
+    out = bytearray(HEADER.pack(MAGIC, VERSION, _MANUAL if replay.manual else 0,
+                                STATUSES.index(replay.status), replay.level, replay.seed,
+                                replay.width, replay.height, replay.enemies,
+                                replay.ticks, len(replay.inputs)))
+    last = 0
+    for tick, name, args in replay.inputs:
+        _put_varint(out, tick - last)
+        last = tick
+        if name == "move":
+            out.append(DIRECTIONS.index(args[0]))
+        elif name == "set_manual":
+            out.append(_MANUAL_ON if args[0] else _MANUAL_OFF)
+        elif name == "set_frozen":
+            out.append(_FREEZE if args[0] else _THAW)
+        elif name == "stop_autopilot":
+            out.append(_STOP)
+        elif name == "engage_autopilot":
+            path, timed = args
+            out.append(_TIMED_AUTOPILOT if timed else _AUTOPILOT)
+            _put_varint(out, len(path))
+            x, y = path[0]
+            _put_varint(out, x)
+            _put_varint(out, y)
+            for nx, ny in path[1:]:          # one slide (or wait) per step: small deltas
+                _put_varint(out, _zigzag(nx - x))
+                _put_varint(out, _zigzag(ny - y))
+                x, y = nx, ny
+        else:
+            raise ValueError(f"unknown simulation input {name!r}")
+    return bytes(out)
+
+
+def decode(data):
+    """Replay from bytes; ValueError if data is not a replay."""
+    if len(data) < HEADER.size:
+        raise ValueError("truncated replay header")
+    (magic, version, flags, status, level, seed, width, height, enemies,
+     ticks, count) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an ice maze replay (or an unsupported version)")
+    inputs = []
+    i = HEADER.size
+    tick = 0
+    try:
+        for _ in range(count):
+            delta, i = _get_varint(data, i)
+            tick += delta
+            op = data[i]
+            i += 1
+            if op < 4:
+                inputs.append((tick, "move", (DIRECTIONS[op],)))
+            elif op in (_MANUAL_OFF, _MANUAL_ON):
+                inputs.append((tick, "set_manual", (op == _MANUAL_ON,)))
+            elif op in (_THAW, _FREEZE):
+                inputs.append((tick, "set_frozen", (op == _FREEZE,)))
+            elif op == _STOP:
+                inputs.append((tick, "stop_autopilot", ()))
+            elif op in (_AUTOPILOT, _TIMED_AUTOPILOT):
+                n, i = _get_varint(data, i)
+                x, i = _get_varint(data, i)
+                y, i = _get_varint(data, i)
+                path = [(x, y)]
+                for _ in range(n - 1):
+                    dx, i = _get_varint(data, i)
+                    dy, i = _get_varint(data, i)
+                    x += _unzigzag(dx)
+                    y += _unzigzag(dy)
+                    path.append((x, y))
+                inputs.append((tick, "engage_autopilot", (path, op == _TIMED_AUTOPILOT)))
+            else:
+                raise ValueError(f"unknown opcode {op} at byte {i - 1}")
+    except IndexError:
+        raise ValueError("truncated replay") from None
+    return Replay(level, seed, width, height, enemies, bool(flags & _MANUAL),
+                  STATUSES[status], ticks, inputs)
+
+
+def save(path, replay):
+    with open(path, "wb") as f:
+        f.write(encode(replay))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+# ---------- playback ----------
+@lru_cache(maxsize=16)
+def _maze(level, seed, width, height, enemies):
+    if width:
+        from generator import generate_maze
+        return generate_maze(width, height, seed, enemies=enemies)
+    return Maze(level)
+
+
+def play(replay):
+    """Re-run replay on a fresh Simulation as fast as possible; returns the Simulation."""
+    # Mazes are cached per process: only key_collected changes during play.
+    maze = _maze(replay.level, replay.seed, replay.width, replay.height, replay.enemies)
+    maze.key_collected = False
+    sim = Simulation(maze, manual=replay.manual)
+    for tick, name, args in replay.inputs:
+        sim.run(tick - sim.tick_count)
+        getattr(sim, name)(*args)
+    sim.run(replay.ticks - sim.tick_count)
+    return sim
+
+
+def verify(data):
+    """Play replay bytes and compare the outcome with the recorded one."""
+    replay = decode(data)
+    sim = play(replay)
+    expected = (replay.status, replay.ticks)
+    actual = (sim.status, sim.tick_count)
+    return {"ok": expected == actual, "expected": expected, "actual": actual}
+
+
+def verify_file(path):
+    with open(path, "rb") as f:
+        return {"file": path, **verify(f.read())}
+
+
+def verify_files(paths, workers=None, chunksize=None):
+    """Yield verify_file results for paths, in order, sharded across a process pool."""
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        yield from map(verify_file, paths)
+        return
+    # Replays take about a millisecond; large chunks keep IPC out of the way.
+    chunksize = chunksize or max(1, len(paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(verify_file, paths, chunksize=chunksize)
+
+
+# ---------- command line ----------
+def _record(args):
+    os.makedirs(args.output, exist_ok=True)
+    runs = [(f"level{lvl}", (lvl, 0, 0, 0, 0)) for lvl in args.levels]
+    if args.generate:
+        width, height = args.generate
+        runs += [(f"gen{width}x{height}-{seed}", (0, seed, width, height, args.enemies))
+                 for seed in range(args.seeds)]
+    count = 0
+    for name, spec in runs:
+        for algorithm in args.algorithm:
+            maze = _maze(*spec)
+            maze.key_collected = False
+            found, sim = fly_autopilot(maze, algorithm, args.max_ticks, record=True)
+            save(os.path.join(args.output, f"{name}-{algorithm}.imr"),
+                 capture(sim, spec[1:] if spec[2] else None))
+            untimed = " (untimed: patrols could not be tabulated)" \
+                if algorithm == "spacetime" and found and not sim.timed_autopilot else ""
+            print(f"{name} {algorithm:>9}: {sim.status} after {sim.tick_count} ticks{untimed}")
+            count += 1
+    print(f"{count} replays written to {args.output}")
+    return 0
+
+
+def _verify(args):
+    paths = []
+    for pattern in args.files:
+        paths += sorted(glob.glob(os.path.join(pattern, "*.imr"))) if os.path.isdir(pattern) \
+            else sorted(glob.glob(pattern)) or [pattern]
+    paths *= args.repeat
+    t0 = time.perf_counter()
+    failed = 0
+    for result in verify_files(paths, args.workers):
+        if not result["ok"]:
+            failed += 1
+            print(f"MISMATCH {result['file']}: recorded {result['expected']}, replayed {result['actual']}")
+    elapsed = time.perf_counter() - t0
+    print(f"{len(paths) - failed}/{len(paths)} replays verified in {elapsed:.2f} s "
+          f"({len(paths) / elapsed if elapsed > 0 else 0:.0f}/s)")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and verify ice maze replays.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="fly the autopilot headless and save each run as a replay")
+    rec.add_argument("--levels", type=int, nargs="*", default=list(range(1, 6)), choices=range(1, 6))
+    rec.add_argument("--generate", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                     help="also record generated mazes of this size")
+    rec.add_argument("--seeds", type=int, default=10, help="generated mazes to record (seeds 0..N-1)")
+    rec.add_argument("--enemies", type=int, default=0, help="patrols per generated maze")
+    rec.add_argument("--algorithm", nargs="+", default=["bfs", "spacetime"],
+                     choices=sorted(ENGINES) + ["spacetime"])
+    rec.add_argument("--max-ticks", type=int, default=100_000)
+    rec.add_argument("-o", "--output", default="replays", help="directory for the .imr files")
+
+    ver = sub.add_parser("verify", help="replay files headless and check their outcomes")
+    ver.add_argument("files", nargs="+", help="replay files, globs or directories")
+    ver.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    ver.add_argument("--repeat", type=int, default=1, help="verify every file this many times (benchmarking)")
+
+    args = parser.parse_args(argv)
+    return _record(args) if args.command == "record" else _verify(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
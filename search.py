@@ -0,0 +1,962 @@
+"""Search engines over the (position, has_key) slide state space (no pygame needed)."""
+from array import array
+from collections import deque
+import heapq
+from time import perf_counter
+
+# Short names used by the command-line tools -> SearchAlgorithm method
+ENGINES = {
+    "bfs": "bfs_with_key",
+    "dfs": "dfs_with_key",
+    "astar": "astar_with_key",
+    "idastar": "idastar_with_key",
+    "bibfs": "bidirectional_bfs_with_key",
+    "iddfs": "iddfs_with_key",
+    "frontier": "frontier_with_key",
+}
+
+
+def run_steps(steps):
+    """Drive a step generator to the end and return its result (found or not)."""
+    try:
+        while True:
+            next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+
+class SearchTask:
+    """A search that is advanced a time slice at a time (e.g. once per frame).
+
+    steps is one of the SearchAlgorithm.iter_* generators, which yield after
+    every expansion. done and found are set once the generator finishes.
+    """
+    CLOCK_EVERY = 32                 # expansions between clock reads
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.done = False
+        self.found = False
+
+    def advance(self, budget=None):
+        """Run for about `budget` seconds (None = to the end); return done."""
+        if self.done:
+            return True
+        steps = self.steps
+        try:
+            if budget is None:
+                while True:
+                    next(steps)
+            deadline = perf_counter() + budget
+            every = self.CLOCK_EVERY
+            while True:
+                for _ in range(every):
+                    next(steps)
+                if perf_counter() >= deadline:
+                    return False
+        except StopIteration as stop:
+            self.done = True
+            self.found = bool(stop.value)
+            return True
+
+    def cancel(self):
+        """Abandon the search; the SearchAlgorithm keeps its partial results."""
+        self.steps.close()
+        self.done = True
+
+
+# ---------------------------
+# Blind search (BFS/DFS)
+# ---------------------------
+class _Discard:
+    """Takes the place of search_order and the explored bytes when tracing is off."""
+    __slots__ = ()
+
+    def append(self, item):
+        pass
+
+    def __setitem__(self, index, value):
+        pass
+
+
+_DISCARD = _Discard()
+
+
+class CellBitmap:
+    """Set of grid positions stored as one byte per cell (row-major)."""
+    def __init__(self, width=0, height=0):
+        self.width = width
+        self.bits = bytearray(width * height)
+
+    def add(self, pos):
+        self.bits[pos[1] * self.width + pos[0]] = 1
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+    def __contains__(self, pos):
+        x, y = pos
+        i = y * self.width + x
+        return 0 <= x < self.width and 0 <= i < len(self.bits) and self.bits[i] == 1
+
+    def __len__(self):
+        return self.bits.count(1)
+
+    def __iter__(self):
+        w = self.width
+        for i, b in enumerate(self.bits):
+            if b:
+                yield (i % w, i // w)
+
+
+def _slot_of(slides, node, stop):
+    """Direction slot of node's slide that ends at stop."""
+    base = node * 4
+    if slides[base] == stop:
+        return 0
+    if slides[base + 1] == stop:
+        return 1
+    return 2 if slides[base + 2] == stop else 3
+
+
+class SearchAlgorithm:
+    """BFS/DFS over the (position, has_key) state space.
+
+    Internally a state is packed into one int, (y*width + x)*2 + has_key, so
+    visited sets are bytearrays indexed by state and frontiers hold plain ints.
+
+    Every engine is written as an iter_* generator that yields after each
+    expansion and returns whether a path was found; the plain methods
+    (bfs_with_key, ...) run it to completion.
+
+    With trace=False search_order and explored stay empty, which saves a
+    tuple per expansion on boards too big to animate anyway.
+    """
+    def __init__(self, maze, graph=None, trace=True):
+        self.maze = maze
+        self.graph = graph           # optional stop_graph.StopGraph of maze
+        self.trace = trace
+        self.explored = CellBitmap(maze.width, maze.height) if trace else CellBitmap()  # UI coloring only
+        self.path = []               # final path (list of positions)
+        self.search_order = []       # order positions were expanded (for viz)
+        self.algorithm_used = None
+        self.nodes_expanded = 0
+        self.peak_frontier = 0       # largest open list seen during the last search
+        self.duplicate_hits = 0      # generated/popped states dropped as already seen
+        self.degraded = False        # a memory cap cost the last result its optimality guarantee
+
+    def reset(self):
+        self.explored = CellBitmap(self.maze.width, self.maze.height) if self.trace else CellBitmap()
+        self.path.clear()
+        self.search_order.clear()
+        self.algorithm_used = None
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.duplicate_hits = 0
+        self.degraded = False
+
+    def _recorders(self):
+        """(search_order, explored bytes) for an engine to fill, or sinks when tracing is off."""
+        if self.trace:
+            return self.search_order, self.explored.bits
+        return _DISCARD, _DISCARD
+
+    def solve(self, algorithm, start, goal, key_pos, has_key_start=False, **options):
+        """Run the engine registered under `algorithm` in ENGINES (options go to the engine)."""
+        if algorithm not in ENGINES:
+            raise ValueError(f"unknown algorithm {algorithm!r}; expected one of {sorted(ENGINES)}")
+        return getattr(self, ENGINES[algorithm])(start, goal, key_pos, has_key_start, **options)
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        w = self.maze.width
+        slides = self.maze.slides
+        base = (y * w + x) * 4
+        neighbors = []
+        for d in range(4):                 # same order as DIRECTIONS
+            stop = slides[base + d]
+            if stop >= 0:
+                neighbors.append((stop % w, stop // w))
+        return neighbors
+
+    def _topology(self):
+        """(slides, cells) the engines walk: the grid itself or self.graph's stop points.
+
+        Engines index states by node; cells[node] is the node's flat cell index.
+        """
+        if self.graph is None:
+            slides = self.maze.slides
+            return slides, range(len(slides) // 4)
+        return self.graph.slides, self.graph.cells
+
+    def _cell(self, pos):
+        """Node of pos (its flat cell index unless a StopGraph is used), or -1 for None/no node."""
+        if pos is None:
+            return -1
+        cell = pos[1] * self.maze.width + pos[0]
+        return cell if self.graph is None else self.graph.node_of(cell)
+
+    def _start_state(self, start, has_key_start):
+        node = self._cell(start)
+        if node < 0:
+            raise ValueError(f"start {tuple(start)} is not a stop point of the search graph")
+        return node * 2 + (1 if has_key_start else 0)
+
+    def _rebuild_path(self, parent, state):
+        """Walk predecessor links back from a packed state and return positions."""
+        w = self.maze.width
+        cells = self._topology()[1]
+        path = []
+        while state >= 0:
+            cell = cells[state >> 1]
+            path.append((cell % w, cell // w))
+            state = parent[state]
+        path.reverse()
+        return path
+
+    def steps(self, algorithm, start, goal, key_pos, has_key_start=False, **options):
+        """Step generator for the engine registered under `algorithm` in ENGINES."""
+        if algorithm not in ENGINES:
+            raise ValueError(f"unknown algorithm {algorithm!r}; expected one of {sorted(ENGINES)}")
+        return getattr(self, "iter_" + ENGINES[algorithm])(start, goal, key_pos, has_key_start, **options)
+
+    # ---------- Run-to-completion entry points ----------
+    def bfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        return run_steps(self.iter_bfs_with_key(start, goal, key_pos, has_key_start))
+
+    def dfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        return run_steps(self.iter_dfs_with_key(start, goal, key_pos, has_key_start))
+
+    def bidirectional_bfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        return run_steps(self.iter_bidirectional_bfs_with_key(start, goal, key_pos, has_key_start))
+
+    def spacetime_with_key(self, start, goal, key_pos, patrols, has_key_start=False, max_states=1 << 21):
+        return run_steps(self.iter_spacetime_with_key(start, goal, key_pos, patrols, has_key_start,
+                                                      max_states))
+
+    def astar_with_key(self, start, goal, key_pos, has_key_start=False):
+        return run_steps(self.iter_astar_with_key(start, goal, key_pos, has_key_start))
+
+    def idastar_with_key(self, start, goal, key_pos, has_key_start=False, table_size=1 << 16):
+        return run_steps(self.iter_idastar_with_key(start, goal, key_pos, has_key_start, table_size))
+
+    def iddfs_with_key(self, start, goal, key_pos, has_key_start=False, memory_cap=1 << 16,
+                       max_expansions=None):
+        return run_steps(self.iter_iddfs_with_key(start, goal, key_pos, has_key_start, memory_cap,
+                                                  max_expansions))
+
+    def frontier_with_key(self, start, goal, key_pos, has_key_start=False, memory_cap=None, checkpoint=16):
+        return run_steps(self.iter_frontier_with_key(start, goal, key_pos, has_key_start,
+                                                     memory_cap, checkpoint))
+
+    # ---------- Step generators ----------
+    def iter_bfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        self.reset()
+        self.algorithm_used = "BFS with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+
+        # seen/parent are indexed by packed state; path built on success
+        seen = bytearray(len(slides) // 2)
+        parent = array('i', [-1]) * len(seen)
+        s0 = self._start_state(start, has_key_start)
+        seen[s0] = 1
+        q = deque([s0])
+
+        while q:
+            if len(q) > self.peak_frontier:
+                self.peak_frontier = len(q)
+            st = q.popleft()
+            cur = st >> 1
+            c = cells[cur]
+            order.append((c % w, c // w))
+            self.nodes_expanded += 1
+            explored[c] = 1
+            yield
+
+            has_key = 1 if (st & 1 or cur == key_c) else 0
+            if cur == goal_c and has_key:
+                self.path = self._rebuild_path(parent, st)
+                return True
+
+            base = cur * 4
+            for d in range(4):
+                nb = slides[base + d]
+                if nb < 0 or (nb == goal_c and not has_key):
+                    continue
+                nst = nb * 2 + has_key
+                if not seen[nst]:
+                    seen[nst] = 1
+                    parent[nst] = st
+                    q.append(nst)
+                else:
+                    self.duplicate_hits += 1
+        return False
+
+    def iter_dfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        self.reset()
+        self.algorithm_used = "DFS with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+
+        # A state can be pushed several times before it is popped, so the
+        # stack holds (predecessor, state) int pairs and the first pop of a
+        # state decides its parent.
+        seen = bytearray(len(slides) // 2)
+        parent = array('i', [-1]) * len(seen)
+        stack = [-1, self._start_state(start, has_key_start)]
+
+        while stack:
+            if len(stack) > 2 * self.peak_frontier:
+                self.peak_frontier = len(stack) // 2
+            st = stack.pop()
+            prev = stack.pop()
+            if seen[st]:
+                self.duplicate_hits += 1
+                continue
+            seen[st] = 1
+            parent[st] = prev
+            cur = st >> 1
+
+            c = cells[cur]
+            order.append((c % w, c // w))
+            self.nodes_expanded += 1
+            explored[c] = 1
+            yield
+
+            has_key = 1 if (st & 1 or cur == key_c) else 0
+            if cur == goal_c and has_key:
+                self.path = self._rebuild_path(parent, st)
+                return True
+
+            base = cur * 4
+            for d in (3, 2, 1, 0):         # reversed(DIRECTIONS)
+                nb = slides[base + d]
+                if nb < 0 or (nb == goal_c and not has_key):
+                    continue
+                nst = nb * 2 + has_key
+                if not seen[nst]:
+                    stack.append(st)
+                    stack.append(nst)
+                else:
+                    self.duplicate_hits += 1
+        return False
+
+    def iter_bidirectional_bfs_with_key(self, start, goal, key_pos, has_key_start=False):
+        """BFS from the start and backwards from (goal, has key) at once.
+
+        The backward half walks Maze.slide_sources(). A predecessor keeps the
+        key flag of its successor, except that a predecessor standing on the
+        key may also arrive without it, which is how the two key phases join.
+        Whole layers of the smaller frontier are expanded at a time and the
+        search stops after the first layer that meets the other side, so the
+        slide count equals bfs_with_key's.
+        """
+        self.reset()
+        self.algorithm_used = "Bidirectional BFS with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        sources = (self.graph or self.maze).slide_sources
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+
+        s0 = self._start_state(start, has_key_start)
+        if s0 >> 1 == goal_c and (s0 & 1 or goal_c == key_c):
+            order.append(start)
+            self.nodes_expanded += 1
+            explored[cells[goal_c]] = 1
+            yield
+            self.path = [start]
+            return True
+
+        n_states = len(slides) // 2
+        dist_f = array('i', [-1]) * n_states
+        dist_b = array('i', [-1]) * n_states
+        parent = array('i', [-1]) * n_states     # forward: predecessor state
+        child = array('i', [-1]) * n_states      # backward: successor state
+        t0 = goal_c * 2 + 1
+        dist_f[s0] = 0
+        dist_b[t0] = 0
+        front_f, front_b = [s0], [t0]
+        meet, best = -1, -1
+
+        while front_f and front_b and meet < 0:
+            if len(front_f) + len(front_b) > self.peak_frontier:
+                self.peak_frontier = len(front_f) + len(front_b)
+            nxt = []
+            if len(front_f) <= len(front_b):
+                for st in front_f:
+                    cur = st >> 1
+                    c = cells[cur]
+                    order.append((c % w, c // w))
+                    self.nodes_expanded += 1
+                    explored[c] = 1
+                    yield
+                    has_key = 1 if (st & 1 or cur == key_c) else 0
+                    depth = dist_f[st] + 1
+                    base = cur * 4
+                    for d in range(4):
+                        nb = slides[base + d]
+                        if nb < 0 or (nb == goal_c and not has_key):
+                            continue
+                        nst = nb * 2 + has_key
+                        if dist_f[nst] >= 0:
+                            self.duplicate_hits += 1
+                            continue
+                        dist_f[nst] = depth
+                        parent[nst] = st
+                        nxt.append(nst)
+                        if dist_b[nst] >= 0 and (meet < 0 or depth + dist_b[nst] < best):
+                            meet, best = nst, depth + dist_b[nst]
+                front_f = nxt
+            else:
+                for st in front_b:
+                    cur, has_key = st >> 1, st & 1
+                    c = cells[cur]
+                    order.append((c % w, c // w))
+                    self.nodes_expanded += 1
+                    explored[c] = 1
+                    yield
+                    if cur == goal_c and not has_key:
+                        continue                 # the goal is never entered keyless
+                    depth = dist_b[st] + 1
+                    for p in sources(cur):
+                        if has_key:
+                            preds = (p * 2 + 1, p * 2) if p == key_c else (p * 2 + 1,)
+                        elif p == key_c:
+                            continue             # standing on the key sets the flag
+                        else:
+                            preds = (p * 2,)
+                        for pst in preds:
+                            if dist_b[pst] >= 0:
+                                self.duplicate_hits += 1
+                                continue
+                            dist_b[pst] = depth
+                            child[pst] = st
+                            nxt.append(pst)
+                            if dist_f[pst] >= 0 and (meet < 0 or depth + dist_f[pst] < best):
+                                meet, best = pst, depth + dist_f[pst]
+                front_b = nxt
+
+        if meet < 0:
+            return False
+        path = self._rebuild_path(parent, meet)
+        st = child[meet]
+        while st >= 0:
+            cell = cells[st >> 1]
+            path.append((cell % w, cell // w))
+            st = child[st]
+        self.path = path
+        return True
+
+    # ---------- Batched queries: every start at once ----------
+    def goal_distances(self, goal, key_pos):
+        """One reverse BFS from (goal, has key) over all states; returns (dist, moves).
+
+        Both are indexed by packed state, node*2 + has_key, with the engines'
+        key rule: the flag is the one on arrival, and a state on the key cell
+        counts as holding it. dist[st] is the fewest slides to finish (-1 if
+        it cannot) and moves[st] the DIRECTIONS index of an optimal first
+        slide (-1 at the finish or when unreachable).
+        """
+        self.reset()
+        self.algorithm_used = "Reverse BFS from Echo Base (all starts)"
+        slides = self._topology()[0]
+        sources = (self.graph or self.maze).slide_sources
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+
+        dist = array('i', [-1]) * (len(slides) // 2)
+        moves = array('b', [-1]) * len(dist)
+        t0 = goal_c * 2 + 1
+        dist[t0] = 0
+        layer = [t0]
+        depth = 0
+        while layer:
+            if len(layer) > self.peak_frontier:
+                self.peak_frontier = len(layer)
+            depth += 1
+            nxt = []
+            for st in layer:
+                cur, has_key = st >> 1, st & 1
+                if cur == goal_c and not has_key:
+                    continue                 # the goal is never entered keyless
+                for p in sources(cur):
+                    pst = p * 2 + has_key
+                    if p == key_c:
+                        if not has_key:
+                            continue         # standing on the key sets the flag
+                        if dist[pst - 1] < 0:    # arriving keyless picks it up here
+                            dist[pst - 1] = depth
+                            moves[pst - 1] = _slot_of(slides, p, cur)
+                            nxt.append(pst - 1)
+                    if dist[pst] < 0:
+                        dist[pst] = depth
+                        moves[pst] = _slot_of(slides, p, cur)
+                        nxt.append(pst)
+                    else:
+                        self.duplicate_hits += 1
+            self.nodes_expanded += len(layer)
+            layer = nxt
+        return dist, moves
+
+    def multi_start(self, goal, key_pos, starts=None, has_key_start=False):
+        """Slides to finish and first move from many starts, from one goal_distances pass.
+
+        With a list of (x, y) starts, returns (dist, moves) arrays aligned
+        with it; otherwise they are indexed by flat cell, y*width + x, over
+        the whole board. Entries are -1 where a start cannot finish (or is
+        not a node of self.graph); moves hold DIRECTIONS indices.
+        """
+        by_state, first = self.goal_distances(goal, key_pos)
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        flag = 1 if has_key_start else 0
+        w = self.maze.width
+        if starts is None:
+            cells = self._topology()[1]
+            nodes = [-1] * (w * self.maze.height)
+            for node, c in enumerate(cells):
+                nodes[c] = node
+        else:
+            nodes = [self._cell(pos) for pos in starts]
+        dist = array('i', [-1]) * len(nodes)
+        moves = array('b', [-1]) * len(nodes)
+        for i, node in enumerate(nodes):
+            if node < 0:
+                continue
+            st = node * 2 + (1 if (flag or node == key_c) else 0)
+            if node == goal_c and st & 1:
+                dist[i] = 0
+            else:
+                dist[i] = by_state[st]
+                moves[i] = first[st]
+        return dist, moves
+
+    # ---------- Space-time search around patrols ----------
+    def iter_spacetime_with_key(self, start, goal, key_pos, patrols, has_key_start=False, max_states=1 << 21):
+        """BFS over (pos, has_key, tick row) that never meets a patrol.
+
+        patrols is a patrols.PatrolTable whose tick 0 is "now". Each tick the
+        player either waits or makes one slide while every patrol steps once.
+        A move is rejected if a patrol stands on the player's cell after the
+        tick or if player and patrol would swap cells. self.path holds one position per tick, so a
+        repeated position is a wait; it is the fewest ticks to finish.
+
+        Visited states are kept in a dict, since a long patrol timeline times
+        the board is far more than a search ever reaches. Past max_states of
+        them the search gives up with no path and degraded set.
+        """
+        self.reset()
+        self.algorithm_used = "Space-Time BFS with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+        occ = patrols.cells
+        layer = len(slides) // 2                  # states per tick row
+
+        s0 = self._start_state(start, has_key_start)
+        parent = {s0: -1}                         # also the visited set
+        q = deque([s0])
+
+        while q:
+            if len(q) > self.peak_frontier:
+                self.peak_frontier = len(q)
+            st = q.popleft()
+            row, rest = divmod(st, layer)
+            cur = rest >> 1
+            c = cells[cur]
+            order.append((c % w, c // w))
+            self.nodes_expanded += 1
+            explored[c] = 1
+            yield
+
+            has_key = 1 if (rest & 1 or cur == key_c) else 0
+            if cur == goal_c and has_key:
+                path = []
+                while st >= 0:
+                    cell = cells[(st % layer) >> 1]
+                    path.append((cell % w, cell // w))
+                    st = parent[st]
+                path.reverse()
+                self.path = path
+                return True
+
+            nrow = patrols.next_index(row)
+            now, nxt = occ[row], occ[nrow]
+            base = nrow * layer
+            moves = [cur] if c not in nxt else []             # wait
+            for d in range(4):
+                nb = slides[cur * 4 + d]
+                if nb < 0 or cells[nb] in nxt or (nb == goal_c and not has_key):
+                    continue
+                # a patrol heading the other way would meet us mid-slide
+                if any(a == cells[nb] and b == c for a, b in zip(now, nxt)):
+                    continue
+                moves.append(nb)
+            for nb in moves:
+                nst = base + nb * 2 + has_key
+                if nst not in parent:
+                    parent[nst] = st
+                    q.append(nst)
+                else:
+                    self.duplicate_hits += 1
+            if len(parent) > max_states:
+                self.degraded = True
+                return False
+        return False
+
+    # ---------- Informed search (A* / IDA*) ----------
+    def _slide_heuristic(self, goal_c, key_c):
+        """Return h(state): admissible lower bound on slides left to finish.
+
+        One slide changes only x or only y, so reaching a cell takes at least
+        0 slides (same cell), 1 (same row or column) or 2 (otherwise). Without
+        the key the bound is taken through the key cell. Each slide changes
+        the bound by at most one, so it is also consistent.
+        """
+        w = self.maze.width
+        cells = self._topology()[1]
+        goal_c = cells[goal_c] if goal_c >= 0 else -1
+        key_c = cells[key_c] if key_c >= 0 else -1
+
+        def bound(a, b):
+            if a == b:
+                return 0
+            return 1 if (a % w == b % w or a // w == b // w) else 2
+
+        key_to_goal = bound(key_c, goal_c) if key_c >= 0 else 0
+
+        def h(st):
+            cur = cells[st >> 1]
+            if st & 1 or cur == key_c:
+                return bound(cur, goal_c)
+            return bound(cur, key_c) + key_to_goal
+        return h
+
+    def iter_astar_with_key(self, start, goal, key_pos, has_key_start=False):
+        self.reset()
+        self.algorithm_used = "A* with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+        h = self._slide_heuristic(goal_c, key_c)
+
+        closed = bytearray(len(slides) // 2)
+        parent = array('i', [-1]) * len(closed)
+        g_cost = array('i', [-1]) * len(closed)
+        s0 = self._start_state(start, has_key_start)
+        g_cost[s0] = 0
+        # (f, -g, state): among equal f prefer the deeper entry
+        heap = [(h(s0), 0, s0)]
+
+        while heap:
+            if len(heap) > self.peak_frontier:
+                self.peak_frontier = len(heap)
+            _, neg_g, st = heapq.heappop(heap)
+            if closed[st]:
+                self.duplicate_hits += 1
+                continue
+            closed[st] = 1
+            cur = st >> 1
+            c = cells[cur]
+            order.append((c % w, c // w))
+            self.nodes_expanded += 1
+            explored[c] = 1
+            yield
+
+            has_key = 1 if (st & 1 or cur == key_c) else 0
+            if cur == goal_c and has_key:
+                self.path = self._rebuild_path(parent, st)
+                return True
+
+            g = 1 - neg_g
+            base = cur * 4
+            for d in range(4):
+                nb = slides[base + d]
+                if nb < 0 or (nb == goal_c and not has_key):
+                    continue
+                nst = nb * 2 + has_key
+                if closed[nst] or (0 <= g_cost[nst] <= g):
+                    self.duplicate_hits += 1
+                    continue
+                g_cost[nst] = g
+                parent[nst] = st
+                heapq.heappush(heap, (g + h(nst), -g, nst))
+        return False
+
+    def iter_idastar_with_key(self, start, goal, key_pos, has_key_start=False, table_size=1 << 16):
+        """Iterative-deepening A*: memory is bounded by table_size, not the state count.
+
+        Each pass is a depth-first walk pruned at f = g + h > bound; the next
+        bound is the smallest f that was pruned. A transposition table of at
+        most table_size states remembers the cheapest g seen in the current
+        pass so transpositions are not re-walked. nodes_expanded counts every
+        visit across all passes.
+        """
+        self.reset()
+        self.algorithm_used = "IDA* with Key Collection"
+        h = self._slide_heuristic(self._cell(goal), self._cell(key_pos))
+        return (yield from self._iter_deepening(start, goal, key_pos, has_key_start, h, table_size))
+
+    def iter_iddfs_with_key(self, start, goal, key_pos, has_key_start=False, memory_cap=1 << 16,
+                            max_expansions=None):
+        """Iterative-deepening DFS over slide moves: IDA*'s walk with no heuristic.
+
+        Memory is the current path plus a transposition table of at most
+        memory_cap states. While the table holds every state reached, a pass
+        reaches exactly the states within its bound, so a pass that reaches
+        no more than the one before proves the goal unreachable. Once more
+        states are reachable than the table holds, states outside it are
+        walked again along every route that reaches them, and the work grows
+        exponentially with depth. Either way the search gives up at
+        max_expansions visits (default 64 per state of the board) with no
+        path and degraded set. A path it does return is always a shortest one.
+        """
+        self.reset()
+        self.algorithm_used = "Iterative-Deepening DFS with Key Collection"
+        if max_expansions is None:
+            max_expansions = 64 * len(self._topology()[0]) // 2
+        return (yield from self._iter_deepening(start, goal, key_pos, has_key_start,
+                                                None, memory_cap, max_expansions))
+
+    def _iter_deepening(self, start, goal, key_pos, has_key_start, h, table_size, max_expansions=None):
+        """Depth-first passes with a growing f = g + h(state) bound (IDA*, IDDFS).
+
+        h must never overestimate, so no bound beyond the state count can
+        find a path that a smaller one missed. h=None is plain iterative
+        deepening (see iter_iddfs_with_key). max_expansions, if given, ends
+        the search with degraded set.
+        """
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+        s0 = self._start_state(start, has_key_start)
+        max_depth = len(slides) // 2        # a shortest path never repeats a state
+        overflowed = False
+        exhaustive = h is None              # bounds go up one slide at a time
+        if exhaustive:
+            h = lambda st: 0
+        reached = 0                         # states the previous pass reached
+
+        bound = h(s0)
+        while bound <= max_depth:
+            next_bound = None
+            stack, dirs = [s0], [0]     # current path and next direction per node
+            best_g = {s0: 0}
+            order.append((start[0], start[1]))
+            self.nodes_expanded += 1
+            explored[cells[s0 >> 1]] = 1
+            yield
+            if s0 >> 1 == goal_c and (s0 & 1 or goal_c == key_c):
+                self.path = [start]
+                return True
+
+            while stack:
+                d = dirs[-1]
+                if d == 4:
+                    stack.pop(); dirs.pop()
+                    continue
+                dirs[-1] = d + 1
+
+                cur = stack[-1] >> 1
+                has_key = 1 if (stack[-1] & 1 or cur == key_c) else 0
+                nb = slides[cur * 4 + d]
+                if nb < 0 or (nb == goal_c and not has_key):
+                    continue
+                nst = nb * 2 + has_key
+                g = len(stack)
+                seen_g = best_g.get(nst)
+                if seen_g is not None and seen_g <= g:
+                    self.duplicate_hits += 1
+                    continue            # also rules out cycles on the current path
+                f = g + h(nst)
+                if f > bound:
+                    if next_bound is None or f < next_bound:
+                        next_bound = f
+                    continue
+
+                if seen_g is not None or len(best_g) < table_size:
+                    best_g[nst] = g
+                elif nst in stack:
+                    self.duplicate_hits += 1
+                    continue
+                else:
+                    overflowed = True
+                if max_expansions is not None and self.nodes_expanded >= max_expansions:
+                    self.degraded = True
+                    return False
+                stack.append(nst); dirs.append(0)
+                if len(stack) > self.peak_frontier:
+                    self.peak_frontier = len(stack)
+                c = cells[nb]
+                order.append((c % w, c // w))
+                self.nodes_expanded += 1
+                explored[c] = 1
+                yield
+                if nb == goal_c and (has_key or nb == key_c):
+                    self.path = [(cells[s >> 1] % w, cells[s >> 1] // w) for s in stack]
+                    return True
+
+            if next_bound is None:
+                return False
+            if exhaustive and not overflowed and len(best_g) == reached:
+                return False                # no state lies one slide further out
+            reached = len(best_g)
+            bound = next_bound
+        return False
+
+    # ---------- Frontier search (no closed set) ----------
+    def iter_frontier_with_key(self, start, goal, key_pos, has_key_start=False, memory_cap=None, checkpoint=16):
+        """Layered BFS that keeps recent layers and sparse checkpoints instead of a closed set.
+
+        A new state is checked only against the two layers before it, so on
+        the directed slide graph a state can come up again at a greater
+        depth, but the goal is still first reached at its shortest depth.
+        Every `checkpoint`-th layer is kept as {state: its state at the
+        previous checkpoint}, and the path is stitched back together with
+        short searches between consecutive checkpoints.
+
+        memory_cap bounds the states held at once (recent layers plus
+        checkpoints), checked once per layer. A layer that would exceed it
+        keeps only the states with the best slide heuristic and degraded is
+        set: the path may then be longer than the shortest, or not found.
+
+        Each layer is a function of the two before it, so when the goal is
+        unreachable the layers eventually cycle instead of running dry.
+        Brent's cycle detection (one earlier pair of layers held for
+        comparison) ends the search there, at most about twice as deep as
+        the cycle starts.
+        """
+        self.reset()
+        self.algorithm_used = "Frontier BFS with Key Collection"
+
+        w = self.maze.width
+        slides, cells = self._topology()
+        goal_c, key_c = self._cell(goal), self._cell(key_pos)
+        order, explored = self._recorders()
+        h = self._slide_heuristic(goal_c, key_c)
+
+        s0 = self._start_state(start, has_key_start)
+        prev = {}
+        layer = {s0: -1}                    # state -> its ancestor at the last checkpoint
+        checkpoints = [layer]               # layers 0, checkpoint, 2 * checkpoint, ...
+        stored = 1                          # states held in checkpoints
+        depth = 0
+        found = -1
+        seen_prev, seen_layer = prev, layer  # Brent: the pair to compare later layers with
+        power = span = 1
+        while layer and found < 0:
+            if len(layer) > self.peak_frontier:
+                self.peak_frontier = len(layer)
+            at_checkpoint = depth % checkpoint == 0
+            nxt = {}
+            for st, anchor in layer.items():
+                cur = st >> 1
+                c = cells[cur]
+                order.append((c % w, c // w))
+                self.nodes_expanded += 1
+                explored[c] = 1
+                yield
+
+                has_key = 1 if (st & 1 or cur == key_c) else 0
+                if cur == goal_c and has_key:
+                    found = st
+                    break
+                if at_checkpoint:
+                    anchor = st
+                base = cur * 4
+                for d in range(4):
+                    nb = slides[base + d]
+                    if nb < 0 or (nb == goal_c and not has_key):
+                        continue
+                    nst = nb * 2 + has_key
+                    if nst in nxt or nst in layer or nst in prev:
+                        self.duplicate_hits += 1
+                        continue
+                    nxt[nst] = anchor
+            if found >= 0:
+                break
+
+            if memory_cap is not None:
+                room = memory_cap - len(layer) - stored
+                if len(nxt) > room:
+                    self.degraded = True
+                    # ties broken by state, so the next layer depends only on this one
+                    keep = heapq.nsmallest(max(room, 0), nxt, key=lambda st: (h(st), st))
+                    nxt = {st: nxt[st] for st in keep}
+            prev, layer = layer, nxt
+            depth += 1
+            if depth % checkpoint == 0 and layer:
+                checkpoints.append(layer)
+                stored += len(layer)
+
+            if len(layer) == len(seen_layer) and layer.keys() == seen_layer.keys() \
+                    and prev.keys() == seen_prev.keys():
+                return False                # the layers repeat: the goal is unreachable
+            if span == power:
+                seen_prev, seen_layer = prev, layer
+                power *= 2
+                span = 0
+            span += 1
+
+        if found < 0:
+            return False
+
+        # Checkpoint states from the start to the goal, then fill each gap
+        # (at most `checkpoint` slides) with a small bounded BFS.
+        chain, depths = [found], [depth]
+        level = (depth - 1) // checkpoint
+        anchor = layer[found]
+        while anchor >= 0:
+            chain.append(anchor)
+            depths.append(level * checkpoint)
+            anchor = checkpoints[level][anchor]
+            level -= 1
+        chain.reverse()
+        depths.reverse()
+
+        states = [s0]
+        for i in range(1, len(chain)):
+            src, dst = chain[i - 1], chain[i]
+            parent = {src: -1}
+            front = [src]
+            for _ in range(depths[i] - depths[i - 1]):
+                nxt = []
+                for st in front:
+                    cur = st >> 1
+                    c = cells[cur]
+                    order.append((c % w, c // w))
+                    self.nodes_expanded += 1
+                    explored[c] = 1
+                    yield
+                    has_key = 1 if (st & 1 or cur == key_c) else 0
+                    for d in range(4):
+                        nb = slides[cur * 4 + d]
+                        if nb < 0 or (nb == goal_c and not has_key):
+                            continue
+                        nst = nb * 2 + has_key
+                        if nst not in parent:
+                            parent[nst] = st
+                            nxt.append(nst)
+                if dst in parent:
+                    break
+                front = nxt
+            segment = []
+            st = dst
+            while st != src:
+                segment.append(st)
+                st = parent[st]
+            states.extend(reversed(segment))
+        self.path = [(cells[st >> 1] % w, cells[st >> 1] // w) for st in states]
+        return True
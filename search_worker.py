@@ -0,0 +1,72 @@
+"""Run searches off the main thread so the game loop keeps its frame rate (no pygame needed)."""
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+import time
+
+from search import SearchTask
+
+
+class SearchJob:
+    """A search submitted to a SearchWorker.
+
+    future resolves to True/False (path found) or None if the job was
+    cancelled. While it runs, the engine keeps updating the SearchAlgorithm's
+    counters and search_order, which progress() and the UI read directly.
+    """
+    SLICE = 0.005                    # seconds between cancellation checks
+
+    def __init__(self, executor, search, steps):
+        self.search = search
+        self.elapsed = None          # seconds the worker spent on it, once done
+        self._cancelled = threading.Event()
+        self.future = executor.submit(self._run, steps)
+
+    def _run(self, steps):
+        t0 = time.perf_counter()
+        task = SearchTask(steps)
+        while not task.advance(self.SLICE):
+            if self._cancelled.is_set():
+                task.cancel()
+                return None
+            time.sleep(0)            # let the render thread take the GIL
+        self.elapsed = time.perf_counter() - t0
+        return task.found
+
+    def cancel(self, wait_stopped=False):
+        """Stop the search at the next slice boundary.
+
+        With wait_stopped=True, block until the worker has let go of the
+        SearchAlgorithm (at most one SLICE), so the caller can reuse it.
+        """
+        self._cancelled.set()
+        if not self.future.cancel() and wait_stopped:
+            wait([self.future])
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        """True/False once done (None if cancelled); call after done()."""
+        return None if self.future.cancelled() else self.future.result()
+
+    def progress(self):
+        """(nodes_expanded, peak_frontier) as last reported by the engine."""
+        return self.search.nodes_expanded, self.search.peak_frontier
+
+
+class SearchWorker:
+    """Single background thread that runs SearchAlgorithm step generators.
+
+    A thread rather than a process: the engine fills search_order and the
+    explored bitmap in place, which the renderer animates while it runs.
+    Use batch.py's process pool for bulk headless solving.
+    """
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+
+    def submit(self, search, steps):
+        """Start running steps (an iter_* generator of search); return a SearchJob."""
+        return SearchJob(self._executor, search, steps)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,267 @@
+"""Fixed-tick game rules: patrols, autopilot, key and exit (no pygame needed).
+
+    sim = Simulation(Maze(3), manual=False)
+    sim.engage_autopilot(path)
+    sim.run(max_ticks=10_000)            # -> COMPLETE, GAME_OVER or RUNNING
+
+    python simulation.py --levels 1 2 3 4 5 --algorithm bfs spacetime
+
+One tick is 1/TICK_RATE s of game time. The game feeds ticks from the wall
+clock; headless callers call tick() as fast as they like, and the same
+inputs on the same ticks always produce the same run. With record=True a
+Simulation logs those inputs for replay.py.
+"""
+import argparse
+import sys
+import time
+
+from distance_field import DistanceField
+from maze import Maze
+from patrols import PatrolSet, PatrolTable
+from search import ENGINES, SearchAlgorithm
+
+TICK_RATE = 60                  # ticks per second of game time
+ENEMY_STEP_TICKS = 21           # patrols move every 0.35 s
+AUTOPILOT_STEP_TICKS = 9        # the autopilot slides every 0.15 s
+
+RUNNING = "running"
+COMPLETE = "complete"
+GAME_OVER = "game_over"
+
+
+class Simulation:
+    """One level of play, advanced one tick at a time.
+
+    manual is True for a human pilot; only then do patrols stepping onto
+    the pilot end the game (an autopilot is checked after its own move).
+    While frozen, patrols hold still, as they do while the game animates a
+    scan. Messages for the player are appended to events as (tick, text).
+
+    Change manual and frozen through set_manual()/set_frozen() so that a
+    recording sees them; inputs then holds (tick, method name, args) for
+    every input that took effect.
+    """
+    def __init__(self, maze, manual=True, record=False):
+        self.maze = maze
+        self.patrols = PatrolSet(maze, getattr(maze, "enemy_spawns", []))
+        self.player_pos = maze.start_pos
+        self.manual = manual
+        self.frozen = False
+        self.tick_count = 0
+        self.status = RUNNING
+        self.events = []
+
+        self.autopilot = False
+        self.timed_autopilot = False     # following a space-time schedule
+        self.autopath = []
+        self.auto_index = 0
+
+        self._enemy_due = 0              # tick of the next patrol step
+        self._auto_due = 0               # tick of the next autopilot slide
+        self._field = None
+        self.inputs = [] if record else None
+
+    def _input(self, name, *args):
+        if self.inputs is not None:
+            self.inputs.append((self.tick_count, name, args))
+
+    def _event(self, text):
+        self.events.append((self.tick_count, text))
+
+    def distance_field(self):
+        """DistanceField of the maze, built on first use."""
+        if self._field is None:
+            self._field = DistanceField(self.maze)
+        return self._field
+
+    # ---------- inputs ----------
+    def move(self, direction):
+        """Slide the pilot one move now; returns whether it moved."""
+        if self.status != RUNNING:
+            return False
+        new_pos = self.maze.slide_move(*self.player_pos, direction)
+        if not new_pos:
+            return False
+        self._input("move", direction)
+        self.player_pos = new_pos
+        if self.patrols.occupied(*new_pos):
+            self._game_over()
+            return True
+        if self.maze.collect_key(new_pos):
+            self._event("Key collected!")
+        if self.maze.can_exit(new_pos):
+            self.status = COMPLETE
+        return True
+
+    def engage_autopilot(self, path, timed=False):
+        """Follow path (positions, path[0] = where to start); timed = one entry per patrol step."""
+        self._input("engage_autopilot", [tuple(p) for p in path], timed)
+        self.autopilot = True
+        self.timed_autopilot = timed
+        self.autopath = list(path)
+        self.auto_index = 0
+        self.player_pos = self.autopath[0]
+        self._auto_due = self.tick_count
+        self._event("Autopilot engaged.")
+
+    def stop_autopilot(self):
+        if self.autopilot:
+            self._input("stop_autopilot")
+        self.autopilot = False
+
+    def set_manual(self, manual):
+        if manual != self.manual:
+            self._input("set_manual", manual)
+            self.manual = manual
+
+    def set_frozen(self, frozen):
+        if frozen != self.frozen:
+            self._input("set_frozen", frozen)
+            self.frozen = frozen
+
+    # ---------- rules ----------
+    def _game_over(self):
+        self.status = GAME_OVER
+        self.autopilot = False
+        self._event("❌ Game Over: a patrol caught you!")
+
+    def _advance_autopilot(self):
+        self.auto_index += 1
+        self.player_pos = self.autopath[self.auto_index]
+        self.maze.collect_key(self.player_pos)
+        if self.maze.can_exit(self.player_pos):
+            self.autopilot = False
+            self.status = COMPLETE
+
+    def _reroute_autopilot(self):
+        """Switch to an equally short route whose next stop is clear; True on success."""
+        field = self.distance_field()
+        here = self.autopath[self.auto_index]
+        has_key = self.maze.key_collected
+        best = field.distance(here, has_key) - 1
+        for left, _, stop in field.moves(here, has_key):
+            if left != best:
+                break
+            if not (self.patrols.occupied(*stop) or self.patrols.occupied_next(*stop)):
+                self.autopath = self.autopath[:self.auto_index + 1] + field.path(stop, has_key)
+                return True
+        return False
+
+    def _step_enemies(self):
+        # A timed autopilot moves on the patrol clock, even with no patrols.
+        if not self.patrols and not self.timed_autopilot:
+            return
+        if self.tick_count < self._enemy_due:
+            return
+        self._enemy_due = self.tick_count + ENEMY_STEP_TICKS
+
+        self.patrols.step()
+        if self.manual and self.patrols.occupied(*self.player_pos):
+            self._game_over()
+            return
+
+        if self.autopilot and self.timed_autopilot:
+            # space-time schedule: exactly one entry per patrol step, no stalls
+            if self.auto_index + 1 < len(self.autopath):
+                self._advance_autopilot()
+            else:
+                self.autopilot = False
+
+    def tick(self):
+        """Advance one tick of game time; returns status."""
+        if self.status != RUNNING:
+            return self.status
+        blocked = False
+        if self.autopilot and not self.timed_autopilot and self.tick_count >= self._auto_due:
+            self._auto_due = self.tick_count + AUTOPILOT_STEP_TICKS
+            if self.auto_index + 1 < len(self.autopath):
+                # blocked if a patrol is on the next stop now or will be after its step
+                nxt = self.autopath[self.auto_index + 1]
+                if self.patrols.occupied(*nxt) or self.patrols.occupied_next(*nxt):
+                    # take another shortest route if one is clear, else wait
+                    if not self._reroute_autopilot():
+                        self._event("Enemy will block the next tile")
+                        blocked = True
+                if not blocked:
+                    self._advance_autopilot()
+            else:
+                self.autopilot = False
+
+        if not self.frozen and self.status == RUNNING:
+            self._step_enemies()
+
+        if not blocked and self.autopilot and self.status == RUNNING \
+                and self.patrols.occupied(*self.player_pos):
+            self._game_over()
+
+        self.tick_count += 1
+        return self.status
+
+    def run(self, max_ticks):
+        """Tick until the level ends or max_ticks more ticks pass; returns status."""
+        end = self.tick_count + max_ticks
+        while self.status == RUNNING and self.tick_count < end:
+            self.tick()
+        return self.status
+
+
+def fly_autopilot(maze, algorithm="bfs", max_ticks=100_000, record=False):
+    """Plan maze from its start and fly the autopilot; returns (found, Simulation).
+
+    algorithm is an ENGINES name or "spacetime" (timed, plans around patrols).
+    When the patrols' timeline is too long to tabulate, "spacetime" falls
+    back to an untimed BFS route (an event says so) that dodges them live.
+    """
+    sim = Simulation(maze, manual=False, record=record)
+    search = SearchAlgorithm(maze)
+    args = (maze.start_pos, maze.goal_pos, maze.key_pos)
+    timed = False
+    if algorithm == "spacetime":
+        try:
+            patrols = PatrolTable(maze, sim.patrols.states())
+        except (ValueError, MemoryError) as e:
+            sim._event(f"Space-time planning unavailable ({e or 'out of memory'}); flying an untimed route")
+            algorithm = "bfs"
+        else:
+            found = search.spacetime_with_key(*args, patrols)
+            timed = True
+    if not timed:
+        found = search.solve(algorithm, *args)
+    if found:
+        sim.engage_autopilot(search.path, timed=timed)
+        sim.run(max_ticks)
+    return found, sim
+
+
+def autopilot_run(level, algorithm="bfs", max_ticks=100_000):
+    """fly_autopilot on a built-in level; returns an outcome dict."""
+    found, sim = fly_autopilot(Maze(level), algorithm, max_ticks)
+    return {"level": level, "algorithm": algorithm, "found": found,
+            "status": sim.status, "ticks": sim.tick_count}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fly the autopilot on levels headless, at full speed.")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(range(1, 6)), choices=range(1, 6))
+    parser.add_argument("--algorithm", nargs="+", default=["bfs", "spacetime"],
+                        choices=sorted(ENGINES) + ["spacetime"])
+    parser.add_argument("--max-ticks", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    total_ticks = 0
+    t0 = time.perf_counter()
+    for level in args.levels:
+        for algorithm in args.algorithm:
+            r = autopilot_run(level, algorithm, args.max_ticks)
+            total_ticks += r["ticks"]
+            failed += r["status"] != COMPLETE
+            print(f"level {r['level']} {r['algorithm']:>9}: {r['status']} after {r['ticks']} ticks")
+    elapsed = time.perf_counter() - t0
+    print(f"{total_ticks} ticks in {elapsed * 1000:.1f} ms "
+          f"({total_ticks / elapsed if elapsed > 0 else 0:.0f} ticks/s incl. planning)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Two-tier cache of search results keyed by maze contents (no pygame needed).
+
+    cache = SolutionCache("~/.cache/ice-maze")
+    found = cache.solve(search, "bfs", start, goal, key_pos)
+
+The key hashes the grid bytes together with start, goal, key, has_key_start,
+the engine name and options, whether the search traced and whether it ran
+on a StopGraph, so editing maze.grid simply produces new keys; stale
+entries are never returned and age out of both tiers. Hits restore path,
+search_order, explored and the counters on the SearchAlgorithm, so the game
+can replay the scan animation without searching.
+"""
+from array import array
+from collections import OrderedDict, namedtuple
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "ice-maze", "solutions")
+FORMAT_VERSION = 2
+
+# path/order are flat cell indices (y*width + x) to keep entries small
+Solution = namedtuple("Solution", "found path order nodes_expanded peak_frontier algorithm_used")
+
+MAGIC = b"ICES"
+# magic, version, found, nodes_expanded, peak_frontier, path length, order length, name bytes;
+# then path and order as little-endian int32 cells and the algorithm name in UTF-8
+_HEADER = struct.Struct("<4sHBQQIII")
+
+
+def solution_key(maze, algorithm, start, goal, key_pos, has_key_start=False,
+                 trace=True, graph=False, options=None):
+    """Hex digest identifying one query against the maze's current grid.
+
+    An untraced search stores an empty search_order, so trace is part of
+    the key; so are graph (searched a StopGraph) and the engine options.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr((FORMAT_VERSION, algorithm, maze.width, maze.height,
+                   tuple(start), tuple(goal), key_pos and tuple(key_pos),
+                   bool(has_key_start), bool(trace), bool(graph),
+                   sorted((options or {}).items()))).encode())
+    for row in maze.grid:
+        h.update(bytes(row))
+    return h.hexdigest()
+
+
+def capture(search, found):
+    """Snapshot a finished SearchAlgorithm as a Solution."""
+    w = search.maze.width
+    return Solution(bool(found),
+                    array('i', [y * w + x for x, y in search.path]),
+                    array('i', [y * w + x for x, y in search.search_order]),
+                    search.nodes_expanded, search.peak_frontier, search.algorithm_used)
+
+
+def encode(solution):
+    """bytes of a Solution for the disk tier."""
+    name = (solution.algorithm_used or "").encode()
+    path, order = array('i', solution.path), array('i', solution.order)
+    if sys.byteorder == "big":
+        path.byteswap()
+        order.byteswap()
+    return b"".join((_HEADER.pack(MAGIC, FORMAT_VERSION, bool(solution.found), solution.nodes_expanded,
+                                  solution.peak_frontier, len(path), len(order), len(name)),
+                     path.tobytes(), order.tobytes(), name))
+
+
+def decode(data):
+    """Solution from encode() bytes; ValueError if they are not a well-formed entry."""
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated solution header")
+    magic, version, found, nodes, peak, n_path, n_order, n_name = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or found > 1:
+        raise ValueError("not a solution cache entry (or an unsupported version)")
+    if len(data) != _HEADER.size + 4 * (n_path + n_order) + n_name:
+        raise ValueError("solution cache entry has the wrong size")
+    cells = array('i')
+    cells.frombytes(data[_HEADER.size:len(data) - n_name])
+    if sys.byteorder == "big":
+        cells.byteswap()
+    if cells and min(cells) < 0:
+        raise ValueError("negative cell in solution cache entry")
+    name = data[len(data) - n_name:].decode() if n_name else None
+    return Solution(bool(found), cells[:n_path], cells[n_path:], nodes, peak, name)
+
+
+def restore(search, solution):
+    """Load a Solution into search as if it had just run; returns found.
+
+    ValueError if the solution names cells outside search's maze.
+    """
+    w = search.maze.width
+    n = w * search.maze.height
+    if max(solution.path, default=0) >= n or max(solution.order, default=0) >= n:
+        raise ValueError("cached solution does not fit this maze")
+    search.reset()
+    search.path = [(c % w, c // w) for c in solution.path]
+    order, bits = search._recorders()    # sinks if search does not trace
+    for c in solution.order:
+        order.append((c % w, c // w))
+        bits[c] = 1
+    search.nodes_expanded = solution.nodes_expanded
+    search.peak_frontier = solution.peak_frontier
+    search.algorithm_used = solution.algorithm_used
+    return solution.found
+
+
+class SolutionCache:
+    """In-memory LRU of Solutions, optionally backed by a directory on disk.
+
+    The disk tier stores one encode()d file per key and, when it grows past
+    max_disk_bytes, deletes the least recently used files (by mtime; hits
+    touch their file). Writes go through a temporary file and os.replace,
+    so several processes can share one directory.
+    """
+    def __init__(self, directory=None, max_entries=256, max_disk_bytes=64 << 20):
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._mem = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._disk_bytes = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def __len__(self):
+        return len(self._mem)
+
+    def _file(self, key):
+        return os.path.join(self.directory, key + ".sol")
+
+    def _disk_entries(self):
+        """(path, size, mtime) of every cache file."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(".sol"):
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:
+                        continue             # evicted by another process
+                    entries.append((e.path, st.st_size, st.st_mtime))
+        return entries
+
+    def get(self, key):
+        """Cached Solution for key, or None."""
+        sol = self._mem.get(key)
+        if sol is not None:
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return sol
+        if self.directory:
+            path = self._file(key)
+            try:
+                with open(path, "rb") as f:
+                    sol = decode(f.read())
+                os.utime(path)
+            except (OSError, ValueError):        # includes bad UTF-8 in the name
+                sol = None
+            if sol is not None:
+                self._remember(key, sol)
+                self.hits += 1
+                return sol
+        self.misses += 1
+        return None
+
+    def put(self, key, solution):
+        self._remember(key, solution)
+        if not self.directory:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode(solution))
+            size = os.path.getsize(tmp)
+            try:
+                size -= os.path.getsize(self._file(key))     # replacing an entry frees its old bytes
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, self._file(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._disk_bytes += size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _remember(self, key, solution):
+        self._mem[key] = solution
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _evict_disk(self):
+        # Recount from the directory: other processes may share it.
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 3 // 4       # leave headroom before the next sweep
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        self._mem.clear()
+        if self.directory:
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._disk_bytes = 0
+
+    def solve(self, search, algorithm, start, goal, key_pos, has_key_start=False, **options):
+        """search.solve(...) that answers repeat queries from the cache.
+
+        Results a memory cap degraded are returned but not stored.
+        """
+        key = solution_key(search.maze, algorithm, start, goal, key_pos, has_key_start,
+                           search.trace, search.graph is not None, options)
+        sol = self.get(key)
+        if sol is not None:
+            try:
+                return restore(search, sol)
+            except ValueError:
+                pass                         # a corrupt entry: search again and overwrite it
+        found = search.solve(algorithm, start, goal, key_pos, has_key_start, **options)
+        if not search.degraded:
+            self.put(key, capture(search, found))
+        return found
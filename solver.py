@@ -0,0 +1,175 @@
+"""Headless solver: run a search engine on a level and print the result.
+
+    python solver.py --level 3 --algorithm astar
+    python solver.py --level 3 --all-starts      # slides to finish from every cell
+    python main.py solve --level 5 --json
+
+Imports only the model and search modules, never pygame.
+"""
+import argparse
+import json
+import sys
+import time
+
+from instrument import profile_search
+from maze import DIRECTIONS, Maze
+from search import ENGINES, SearchAlgorithm
+from solution_cache import SolutionCache
+from stop_graph import StopGraph
+
+
+# Engine keyword that holds each memory-bounded engine's cap
+MEMORY_CAP_OPTIONS = {"iddfs": "memory_cap", "frontier": "memory_cap", "idastar": "table_size"}
+
+
+def solve_maze(maze, algorithm, has_key_start=False, cache=None, graph=None, trace=True, **options):
+    """Solve maze from its start and return a JSON-friendly result dict.
+
+    With a SolutionCache, repeat queries are answered from it and the
+    result gains a "cached" flag. graph is an optional StopGraph of maze;
+    trace=False skips the expansion trace; options go to the engine.
+    """
+    search = SearchAlgorithm(maze, graph, trace)
+    t0 = time.perf_counter()
+    if cache is None:
+        found = search.solve(algorithm, maze.start_pos, maze.goal_pos, maze.key_pos, has_key_start, **options)
+    else:
+        hits = cache.hits
+        found = cache.solve(search, algorithm, maze.start_pos, maze.goal_pos, maze.key_pos,
+                            has_key_start, **options)
+    elapsed = time.perf_counter() - t0
+    result = {
+        "algorithm": algorithm,
+        "found": found,
+        "slides": len(search.path) - 1 if found else None,
+        "path": [list(p) for p in search.path],
+        "nodes_expanded": search.nodes_expanded,
+        "time_ms": round(elapsed * 1000, 3),
+        "degraded": search.degraded,
+    }
+    if cache is not None:
+        result["cached"] = cache.hits > hits
+    return result
+
+
+def solve_all_starts(maze, has_key_start=False, graph=None):
+    """Slides to finish and first move from every cell in one reverse search.
+
+    "distance" and "move" are flat lists indexed by y*width + x, with -1 for
+    cells that cannot finish; moves are DIRECTIONS indices.
+    """
+    search = SearchAlgorithm(maze, graph, trace=False)
+    t0 = time.perf_counter()
+    dist, moves = search.multi_start(maze.goal_pos, maze.key_pos, has_key_start=has_key_start)
+    elapsed = time.perf_counter() - t0
+    reachable = [d for d in dist if d >= 0]
+    return {
+        "width": maze.width,
+        "height": maze.height,
+        "solvable_starts": len(reachable),
+        "max_slides": max(reachable, default=None),
+        "nodes_expanded": search.nodes_expanded,
+        "time_ms": round(elapsed * 1000, 3),
+        "distance": list(dist),
+        "move": list(moves),
+    }
+
+
+def format_all_starts(result, maze):
+    """Board of slide counts ('#' wall, '.' cannot finish) plus a summary."""
+    w = result["width"]
+    dist, moves = result["distance"], result["move"]
+    cell = max(2, len(str(result["max_slides"] or 0)) + 1)
+    rows = []
+    for y in range(result["height"]):
+        row = []
+        for x in range(w):
+            d = dist[y * w + x]
+            row.append("#" if maze.is_wall(x, y) else "." if d < 0 else str(d))
+        rows.append("".join(v.rjust(cell) for v in row))
+    sx, sy = maze.start_pos
+    first = moves[sy * w + sx]
+    rows += [
+        f"Solvable starts: {result['solvable_starts']}, longest: {result['max_slides']} slides",
+        f"From the start: {dist[sy * w + sx]} slides, first move {DIRECTIONS[first] if first >= 0 else '-'}",
+        f"Nodes expanded: {result['nodes_expanded']}",
+        f"Time: {result['time_ms']:.3f} ms",
+    ]
+    return "\n".join(rows)
+
+
+def format_result(result, name):
+    lines = [
+        f"Level {result['level']}: {name}",
+        f"Algorithm: {result['algorithm']}",
+        f"Solved: {'yes' if result['found'] else 'no'}",
+    ]
+    if result["found"]:
+        lines.append(f"Slides: {result['slides']}" + (" (memory cap hit: may not be shortest)"
+                                                      if result["degraded"] else ""))
+    elif result["degraded"]:
+        lines.append("Memory cap hit: a path may exist")
+    lines += [
+        f"Nodes expanded: {result['nodes_expanded']}",
+        f"Time: {result['time_ms']:.3f} ms",
+    ]
+    profile = result.get("profile")
+    if profile:
+        lines.append(f"Profile: {profile['wall_ms']:.3f} ms, {profile['nodes_per_sec'] or 0} nodes/s, "
+                     f"peak frontier {profile['peak_frontier']}, {profile['duplicate_hits']} duplicate hits, "
+                     f"peak memory {profile['peak_mem_kb']} kB")
+    if result["found"]:
+        lines.append("Path: " + " -> ".join(f"({x},{y})" for x, y in result["path"]))
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Solve an ice maze level without the game window.")
+    parser.add_argument("--level", type=int, default=1, choices=range(1, 6), help="built-in level (1-5)")
+    parser.add_argument("--file", help="level file to solve instead of a built-in level (see levels.py)")
+    parser.add_argument("--algorithm", default="bfs", choices=sorted(ENGINES), help="search engine")
+    parser.add_argument("--json", action="store_true", help="print one JSON object instead of text")
+    parser.add_argument("--cache-dir", help="reuse/store results in this solution cache directory")
+    parser.add_argument("--stop-graph", action="store_true",
+                        help="search the compressed graph of slide stop points")
+    parser.add_argument("--profile", action="store_true",
+                        help="rerun under tracemalloc and report nodes/s, duplicates and peak memory")
+    parser.add_argument("--all-starts", action="store_true",
+                        help="slides to finish from every cell at once (one reverse search)")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="do not record the expansion order (less memory on huge mazes)")
+    parser.add_argument("--memory-cap", type=int,
+                        help="states kept by iddfs/frontier (table size for idastar)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    maze = Maze.from_file(args.file) if args.file else Maze(args.level)
+    cache = SolutionCache(args.cache_dir) if args.cache_dir else None
+    graph = StopGraph(maze) if args.stop_graph else None
+    if args.all_starts:
+        result = {"level": maze.level, **solve_all_starts(maze, graph=graph)}
+        print(json.dumps(result) if args.json else format_all_starts(result, maze))
+        return 0 if result["solvable_starts"] else 1
+    options = {}
+    if args.memory_cap is not None:
+        if args.algorithm not in MEMORY_CAP_OPTIONS:
+            print(f"--memory-cap needs one of {sorted(MEMORY_CAP_OPTIONS)}", file=sys.stderr)
+            return 2
+        options[MEMORY_CAP_OPTIONS[args.algorithm]] = args.memory_cap
+    trace = not args.no_trace
+    result = {"level": maze.level, **solve_maze(maze, args.algorithm, cache=cache, graph=graph,
+                                                trace=trace, **options)}
+    if args.profile:
+        result["profile"] = profile_search(SearchAlgorithm(maze, graph, trace), args.algorithm,
+                                           maze.start_pos, maze.goal_pos, maze.key_pos, **options)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(format_result(result, maze.get_level_name()))
+    return 0 if result["found"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Compressed slide graph: only cells where a slide can stop (no pygame needed).
+
+    graph = StopGraph(maze)
+    search = SearchAlgorithm(maze, graph)     # every engine, fewer states
+
+Under ice physics the pilot only ever rests where a slide ends, so those
+cells (plus start, goal and key) are the only states a search can reach.
+On open boards they are a small fraction of all cells, and the visited
+sets, parent arrays and space-time layers shrink with them.
+"""
+from array import array
+
+
+class StopGraph:
+    """Stop points of a maze renumbered 0..n-1 with their slide edges.
+
+    cells[node] is the flat cell index (y*width + x) of a node and
+    node_of(cell) maps back (-1 for cells that are never stops). Forward
+    edges use Maze.slides' layout, four slots per node in DIRECTIONS order
+    with -1 for a blocked direction, so the engines read either table the
+    same way; adjacency() and reverse_slides() give CSR arrays. Build a new
+    graph after editing maze.grid.
+    """
+    def __init__(self, maze, keep=None):
+        self.maze = maze
+        self.width = w = maze.width
+        if keep is None:
+            keep = (maze.start_pos, maze.goal_pos, maze.key_pos)
+        raw = maze.slides
+
+        stops = set(raw)
+        stops.discard(-1)
+        stops.update(y * w + x for x, y in (p for p in keep if p is not None))
+        self.cells = cells = array('i', sorted(stops))
+
+        self._index = index = array('i', [-1]) * (w * maze.height)
+        for node, c in enumerate(cells):
+            index[c] = node
+
+        slides = array('i', [-1]) * (4 * len(cells))
+        for node, c in enumerate(cells):
+            base = c * 4
+            for d in range(4):
+                stop = raw[base + d]
+                if stop >= 0:
+                    slides[node * 4 + d] = index[stop]
+        self.slides = slides
+        self._reverse = None
+
+    def __len__(self):
+        return len(self.cells)
+
+    def node_of(self, cell):
+        """Node id of a flat cell index, or -1 if no slide stops there."""
+        return self._index[cell]
+
+    def node(self, pos):
+        """Node id of an (x, y) position; ValueError if it is not a stop point."""
+        node = self._index[pos[1] * self.width + pos[0]]
+        if node < 0:
+            raise ValueError(f"{tuple(pos)} is not a stop point of this graph")
+        return node
+
+    def position(self, node):
+        c = self.cells[node]
+        return (c % self.width, c // self.width)
+
+    def edge_count(self):
+        return len(self.slides) - self.slides.count(-1)
+
+    def adjacency(self):
+        """(adj_start, adj_nodes): successors of node v are adj_nodes[adj_start[v]:adj_start[v + 1]]."""
+        slides = self.slides
+        adj_start = array('i', [0]) * (len(self.cells) + 1)
+        adj_nodes = array('i')
+        for node in range(len(self.cells)):
+            for stop in slides[node * 4:node * 4 + 4]:
+                if stop >= 0:
+                    adj_nodes.append(stop)
+            adj_start[node + 1] = len(adj_nodes)
+        return adj_start, adj_nodes
+
+    def reverse_slides(self):
+        """(rev_start, rev_nodes) in CSR form: the nodes with a slide to node n are
+        rev_nodes[rev_start[n]:rev_start[n + 1]]."""
+        if self._reverse is None:
+            n = len(self.cells)
+            slides = self.slides
+            rev_start = array('i', [0]) * (n + 1)
+            for stop in slides:
+                if stop >= 0:
+                    rev_start[stop + 1] += 1
+            for v in range(n):
+                rev_start[v + 1] += rev_start[v]
+            fill = array('i', rev_start)
+            rev_nodes = array('i', [0]) * rev_start[n]
+            for i, stop in enumerate(slides):
+                if stop >= 0:
+                    rev_nodes[fill[stop]] = i >> 2
+                    fill[stop] += 1
+            self._reverse = (rev_start, rev_nodes)
+        return self._reverse
+
+    def slide_sources(self, node):
+        """Nodes with a slide to node, like Maze.slide_sources() (builds the index on first use)."""
+        rev_start, rev_nodes = self.reverse_slides()
+        return rev_nodes[rev_start[node]:rev_start[node + 1]]
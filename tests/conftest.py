@@ -0,0 +1,42 @@
+"""Shared mazes and checks for the test suite (no pygame needed)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator import generate_maze  # noqa: E402
+from maze import DIRECTIONS, Maze  # noqa: E402
+from search import SearchAlgorithm  # noqa: E402
+
+# (name, factory): built-in levels plus seeded generated boards, square and not
+MAZES = [(f"level{n}", lambda n=n: Maze(n)) for n in range(1, 6)] + [
+    (f"gen{w}x{h}-{seed}", lambda w=w, h=h, seed=seed: generate_maze(w, h, seed))
+    for w, h in ((12, 12), (20, 20), (31, 24))
+    for seed in range(3)
+]
+
+
+def bfs_slides(maze, start, has_key=False, goal=None, key_pos="maze"):
+    """Fewest slides from start to the goal according to bfs_with_key, or -1."""
+    search = SearchAlgorithm(maze, trace=False)
+    key_pos = maze.key_pos if key_pos == "maze" else key_pos
+    found = search.bfs_with_key(start, goal or maze.goal_pos, key_pos, has_key)
+    return len(search.path) - 1 if found else -1
+
+
+def assert_valid_path(maze, path, has_key=False):
+    """path starts anywhere, moves by whole slides, and ends on Echo Base holding the key."""
+    assert path[-1] == tuple(maze.goal_pos)
+    for a, b in zip(path, path[1:]):
+        assert b in {maze.slide_move(*a, d) for d in DIRECTIONS}, (a, b)
+    if not has_key and maze.key_pos is not None:
+        assert tuple(maze.key_pos) in path
+
+
+def wall_off_goal(maze):
+    """Wall in Echo Base's neighbours so that no slide can stop on it."""
+    gx, gy = maze.goal_pos
+    for x, y in ((gx + 1, gy), (gx - 1, gy), (gx, gy + 1), (gx, gy - 1)):
+        if 0 <= x < maze.width and 0 <= y < maze.height and (x, y) not in (maze.start_pos, maze.key_pos):
+            maze.set_cell(x, y, True)
+    return maze
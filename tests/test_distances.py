@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import MAZES, assert_valid_path, bfs_slides
+from distance_field import DistanceField
+from maze import DIRECTIONS
+from search import SearchAlgorithm
+from stop_graph import StopGraph
+
+
+def open_cells(maze):
+    return [(x, y) for y in range(maze.height) for x in range(maze.width) if not maze.is_wall(x, y)]
+
+
+@pytest.mark.parametrize("has_key", [False, True], ids=["no-key", "has-key"])
+@pytest.mark.parametrize("name, make", MAZES[:11], ids=[name for name, _ in MAZES[:11]])
+def test_multi_start_matches_bfs_from_every_cell(name, make, has_key):
+    maze = make()
+    dist, moves = SearchAlgorithm(maze).multi_start(maze.goal_pos, maze.key_pos, has_key_start=has_key)
+    w = maze.width
+    for pos in open_cells(maze):
+        c = pos[1] * w + pos[0]
+        expected = bfs_slides(maze, pos, has_key)
+        assert dist[c] == expected, pos
+        if expected > 0:
+            # the suggested first slide must lead somewhere one slide closer
+            nxt = maze.slide_move(*pos, DIRECTIONS[moves[c]])
+            holds = has_key or nxt == tuple(maze.key_pos) or pos == tuple(maze.key_pos)
+            assert bfs_slides(maze, nxt, holds) == expected - 1, pos
+
+
+@pytest.mark.parametrize("name, make", MAZES[:11], ids=[name for name, _ in MAZES[:11]])
+def test_multi_start_on_stop_graph(name, make):
+    maze = make()
+    graph = StopGraph(maze)
+    starts = [graph.position(n) for n in range(len(graph))]
+    dist, _ = SearchAlgorithm(maze, graph).multi_start(maze.goal_pos, maze.key_pos, starts)
+    assert list(dist) == [bfs_slides(maze, pos) for pos in starts]
+
+
+@pytest.mark.parametrize("name, make", MAZES[:11], ids=[name for name, _ in MAZES[:11]])
+def test_distance_field_matches_bfs(name, make):
+    maze = make()
+    field = DistanceField(maze)
+    for pos in open_cells(maze):
+        for has_key in (False, True):
+            expected = bfs_slides(maze, pos, has_key)
+            assert field.distance(pos, has_key) == expected, (pos, has_key)
+            path = field.path(pos, has_key)
+            if expected > 0:
+                assert len(path) - 1 == expected
+                assert_valid_path(maze, path, has_key or pos == tuple(maze.key_pos))
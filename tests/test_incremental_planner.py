@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from conftest import assert_valid_path, bfs_slides
+from generator import generate_maze
+from incremental_planner import IncrementalPlanner
+from maze import Maze
+
+
+@pytest.mark.parametrize("size, seed", [(12, 0), (16, 1), (24, 2), (24, 5)])
+def test_set_cell_matches_a_full_rebuild(size, seed):
+    maze = generate_maze(size, size, seed)
+    rng = random.Random(seed)
+    for _ in range(60):
+        before = maze.slides[:]
+        x, y = rng.randrange(size), rng.randrange(size)
+        changed = maze.set_cell(x, y, maze.grid[y][x] != 1)
+        patched = maze.slides[:]
+        maze.build_slide_table()
+        assert patched == maze.slides, (x, y)
+        assert changed == sorted({i >> 2 for i in range(len(patched)) if patched[i] != before[i]})
+
+
+@pytest.mark.parametrize("size, seed", [(12, 0), (16, 1), (20, 3), (24, 2)])
+def test_replanning_matches_bfs_after_toggles(size, seed):
+    maze = generate_maze(size, size, seed)
+    planner = IncrementalPlanner(maze)
+    rng = random.Random(seed)
+    fixed = {maze.start_pos, maze.goal_pos, maze.key_pos}
+    pos, has_key = maze.start_pos, False
+    for step in range(80):
+        x, y = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if (x, y) not in fixed and (x, y) != pos:
+            planner.set_cell(x, y, maze.grid[y][x] != 1)
+        expected = bfs_slides(maze, pos, has_key)
+        assert planner.distance() == expected, step
+        path = planner.path()
+        if expected > 0:
+            assert len(path) - 1 == expected and path[0] == pos
+            assert_valid_path(maze, path, has_key or pos == maze.key_pos)
+            if step % 10 == 9:               # the pilot moves one slide along the plan
+                pos = path[1]
+                has_key = has_key or pos == maze.key_pos
+                planner.move_to(pos, has_key)
+        else:
+            assert path == [] and planner.next_move() is None
+
+
+def test_planner_on_built_in_levels():
+    for level in range(1, 6):
+        maze = Maze(level)
+        planner = IncrementalPlanner(maze)
+        assert planner.distance() == bfs_slides(maze, maze.start_pos)
+        direction, stop = planner.next_move()
+        assert maze.slide_move(*maze.start_pos, direction) == stop
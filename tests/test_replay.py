@@ -0,0 +1,68 @@
+import pytest
+
+import replay
+from generator import generate_maze
+from maze import Maze
+from simulation import COMPLETE, Simulation, fly_autopilot
+
+
+def recorded(level=None, algorithm="bfs", generated=None):
+    if generated:
+        seed, width, height, enemies = generated
+        maze = generate_maze(width, height, seed, enemies=enemies)
+    else:
+        maze = Maze(level)
+    found, sim = fly_autopilot(maze, algorithm, record=True)
+    assert found
+    return replay.capture(sim, generated)
+
+
+@pytest.mark.parametrize("level", range(1, 6))
+@pytest.mark.parametrize("algorithm", ["bfs", "spacetime"])
+def test_round_trip_and_verify(level, algorithm):
+    rec = recorded(level, algorithm)
+    data = replay.encode(rec)
+    assert replay.decode(data) == rec
+    result = replay.verify(data)
+    assert result["ok"], result
+
+
+def test_generated_maze_with_patrols():
+    rec = recorded(algorithm="spacetime", generated=(4, 24, 24, 3))
+    assert rec.status == COMPLETE
+    assert replay.verify(replay.encode(rec))["ok"]
+
+
+def test_manual_inputs_round_trip():
+    sim = Simulation(Maze(1), manual=True, record=True)
+    for direction in ("down", "right", "up", "left", "right"):
+        sim.move(direction)
+        sim.run(7)
+    sim.set_frozen(True)
+    sim.run(3)
+    sim.set_frozen(False)
+    sim.set_manual(False)
+    sim.run(5)
+    rec = replay.capture(sim)
+    assert len(rec.inputs) >= 5
+    data = replay.encode(rec)
+    assert replay.decode(data) == rec
+    assert replay.verify(data)["ok"]
+
+
+def test_tampered_outcome_fails_verification():
+    rec = recorded(2)
+    result = replay.verify(replay.encode(rec._replace(ticks=rec.ticks + 1)))
+    assert not result["ok"]
+
+
+@pytest.mark.parametrize("data", [b"", b"IMRP", b"nope" * 20])
+def test_decode_rejects_garbage(data):
+    with pytest.raises(ValueError):
+        replay.decode(data)
+
+
+def test_decode_rejects_truncated_inputs():
+    data = replay.encode(recorded(3))
+    with pytest.raises(ValueError):
+        replay.decode(data[:-2])
@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import MAZES, assert_valid_path, bfs_slides, wall_off_goal
+from generator import generate_maze
+from search import ENGINES, SearchAlgorithm
+from stop_graph import StopGraph
+
+
+@pytest.mark.parametrize("has_key", [False, True], ids=["no-key", "has-key"])
+@pytest.mark.parametrize("use_graph", [False, True], ids=["raw", "stops"])
+@pytest.mark.parametrize("name, make", MAZES, ids=[name for name, _ in MAZES])
+def test_engines_match_bfs(name, make, use_graph, has_key):
+    maze = make()
+    expected = bfs_slides(maze, maze.start_pos, has_key)
+    graph = StopGraph(maze) if use_graph else None
+    for algorithm in sorted(ENGINES):
+        search = SearchAlgorithm(maze, graph)
+        found = search.solve(algorithm, maze.start_pos, maze.goal_pos, maze.key_pos, has_key)
+        assert found == (expected >= 0), algorithm
+        assert not search.degraded, algorithm
+        if found:
+            assert len(search.path) - 1 == expected or algorithm == "dfs", algorithm
+            assert_valid_path(maze, search.path, has_key)
+            assert search.path[0] == tuple(maze.start_pos)
+
+
+@pytest.mark.parametrize("use_graph", [False, True], ids=["raw", "stops"])
+@pytest.mark.parametrize("seed", range(3))
+def test_engines_report_unreachable_goal(seed, use_graph):
+    maze = wall_off_goal(generate_maze(20, 20, seed))
+    graph = StopGraph(maze) if use_graph else None
+    for algorithm in sorted(ENGINES):
+        search = SearchAlgorithm(maze, graph, trace=False)
+        assert not search.solve(algorithm, maze.start_pos, maze.goal_pos, maze.key_pos), algorithm
+        assert search.path == []
+
+
+def test_untraced_search_records_nothing():
+    maze = generate_maze(20, 20, 1)
+    search = SearchAlgorithm(maze, trace=False)
+    assert search.bfs_with_key(maze.start_pos, maze.goal_pos, maze.key_pos)
+    assert search.search_order == [] and len(search.explored) == 0
+    assert search.nodes_expanded > 0
+
+
+def test_iddfs_small_table_gives_up_degraded():
+    maze = wall_off_goal(generate_maze(16, 16, 0))
+    search = SearchAlgorithm(maze, trace=False)
+    assert not search.iddfs_with_key(maze.start_pos, maze.goal_pos, maze.key_pos,
+                                     memory_cap=10, max_expansions=5000)
+    assert search.degraded and search.nodes_expanded <= 5000
+
+
+def test_frontier_memory_cap_sets_degraded():
+    maze = generate_maze(64, 64, 3)
+    search = SearchAlgorithm(maze, trace=False)
+    found = search.frontier_with_key(maze.start_pos, maze.goal_pos, maze.key_pos, memory_cap=30)
+    assert search.degraded
+    if found:
+        assert_valid_path(maze, search.path)
@@ -0,0 +1,116 @@
+from array import array
+import os
+
+import pytest
+
+import solution_cache
+from maze import Maze
+from search import SearchAlgorithm
+from solution_cache import Solution, SolutionCache, decode, encode, solution_key
+from stop_graph import StopGraph
+
+
+@pytest.fixture
+def maze():
+    return Maze(4)
+
+
+def query(maze):
+    return maze.start_pos, maze.goal_pos, maze.key_pos
+
+
+def test_key_depends_on_trace_graph_and_options(maze):
+    keys = {
+        solution_key(maze, "iddfs", *query(maze)),
+        solution_key(maze, "iddfs", *query(maze), trace=False),
+        solution_key(maze, "iddfs", *query(maze), graph=True),
+        solution_key(maze, "iddfs", *query(maze), options={"memory_cap": 100}),
+        solution_key(maze, "iddfs", *query(maze), options={"memory_cap": 200}),
+        solution_key(maze, "bfs", *query(maze)),
+        solution_key(maze, "iddfs", *query(maze), has_key_start=True),
+    }
+    assert len(keys) == 7
+    assert solution_key(maze, "iddfs", *query(maze), options={"memory_cap": 1, "max_expansions": 2}) == \
+        solution_key(maze, "iddfs", *query(maze), options={"max_expansions": 2, "memory_cap": 1})
+
+
+def test_key_changes_when_the_grid_does(maze):
+    before = solution_key(maze, "bfs", *query(maze))
+    maze.set_cell(1, 1, maze.grid[1][1] != 1)
+    assert solution_key(maze, "bfs", *query(maze)) != before
+
+
+def test_untraced_result_is_not_restored_into_a_traced_search(maze, tmp_path):
+    SolutionCache(tmp_path).solve(SearchAlgorithm(maze, trace=False), "bfs", *query(maze))
+    cache = SolutionCache(tmp_path)
+    search = SearchAlgorithm(maze)
+    assert cache.solve(search, "bfs", *query(maze))
+    assert cache.hits == 0 and search.search_order
+
+
+def test_disk_round_trip_restores_the_search(maze, tmp_path):
+    fresh = SearchAlgorithm(maze)
+    SolutionCache(tmp_path).solve(fresh, "astar", *query(maze))
+    cache = SolutionCache(tmp_path)
+    search = SearchAlgorithm(maze)
+    assert cache.solve(search, "astar", *query(maze))
+    assert cache.hits == 1
+    assert search.path == fresh.path and search.search_order == fresh.search_order
+    assert search.nodes_expanded == fresh.nodes_expanded and search.algorithm_used == fresh.algorithm_used
+
+
+def test_graph_searches_get_their_own_entries(maze, tmp_path):
+    cache = SolutionCache(tmp_path)
+    cache.solve(SearchAlgorithm(maze), "bfs", *query(maze))
+    cache.solve(SearchAlgorithm(maze, StopGraph(maze)), "bfs", *query(maze))
+    assert cache.hits == 0 and len(cache) == 2
+
+
+def test_encode_decode():
+    sol = Solution(True, array('i', [3, 4, 5]), array('i', range(40)), 40, 7, "BFS with Key Collection")
+    assert decode(encode(sol)) == sol
+    empty = Solution(False, array('i'), array('i'), 0, 0, None)
+    assert decode(encode(empty)) == empty
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda data: b"",
+    lambda data: data[:-1],
+    lambda data: data + b"x",
+    lambda data: b"XXXX" + data[4:],
+    lambda data: b"\x80\x04\x95" + data[3:],              # a pickle header
+])
+def test_decode_rejects_bad_entries(mangle):
+    data = encode(Solution(True, array('i', [1, 2]), array('i', [1, 2]), 2, 1, "BFS"))
+    with pytest.raises(ValueError):
+        decode(mangle(data))
+
+
+def test_corrupt_disk_entry_is_a_miss(maze, tmp_path):
+    cache = SolutionCache(tmp_path)
+    cache.solve(SearchAlgorithm(maze), "bfs", *query(maze))
+    path = os.path.join(tmp_path, solution_key(maze, "bfs", *query(maze)) + ".sol")
+    with open(path, "wb") as f:
+        f.write(b"not a solution")
+    cache = SolutionCache(tmp_path)
+    search = SearchAlgorithm(maze)
+    assert cache.solve(search, "bfs", *query(maze)) and search.path
+    assert cache.hits == 0
+
+
+def test_out_of_range_cells_are_not_restored(maze, tmp_path):
+    key = solution_key(maze, "bfs", *query(maze))
+    SolutionCache(tmp_path).put(key, Solution(True, array('i', [10 ** 6]), array('i'), 1, 1, "BFS"))
+    with pytest.raises(ValueError):
+        solution_cache.restore(SearchAlgorithm(maze), SolutionCache(tmp_path).get(key))
+    search = SearchAlgorithm(maze)
+    assert SolutionCache(tmp_path).solve(search, "bfs", *query(maze))
+    assert len(search.path) > 1
+
+
+def test_rewriting_a_key_does_not_inflate_disk_bytes(tmp_path):
+    cache = SolutionCache(tmp_path)
+    sol = Solution(True, array('i', [1, 2]), array('i', range(100)), 3, 4, "BFS")
+    for _ in range(20):
+        cache.put("k", sol)
+    assert cache._disk_bytes == len(encode(sol))